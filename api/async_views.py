@@ -0,0 +1,328 @@
+"""
+ASGI-native versions of the todo views, routed instead of the `APIView`s in
+`views.py` when `TODO_ASYNC_VIEWS` is enabled.
+
+Reads go through Django's async ORM, behind the same conditional responses
+and per-user response cache as the sync views. Writes run their transaction
+in one `sync_to_async` call, since transactions are not available in async
+code.
+
+AsyncEventsView is async whatever `TODO_ASYNC_VIEWS` says, as its streams
+are only served by the ASGI app.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+from .authentication import CachedTokenAuthentication
+from .cache import get_cache, invalidate_user, record, response_cache_key
+from .conditional import aconditional_response, detail_fingerprint, list_fingerprint
+from .events import RESET, format_event, get_hub, publish
+from .filters import filter_todo_items, get_ordering, get_sparse_fields, select_fields
+from .metrics import timer
+from .models import TodoItem
+from .pagination import TimestampCursorPagination
+from .renderers import FastJSONRenderer
+from .serializers import TodoItemSerializer, TodoItemTagsSerializer
+from .sync import record_deletions
+from .utils import get_instance_with_tags, set_tags, validate_due_date
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        FastJSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+async def cached_response(request, build):
+    """
+    api.cache.cached_response() for a coroutine function `build` returning
+    `(data, status_code)`; the same entries serve both routings.
+    """
+    cache = get_cache()
+    key = await sync_to_async(response_cache_key)(request)
+    data = await cache.aget(key)
+    if data is not None:
+        record("hits")
+        return render(data)
+
+    record("misses")
+    data, status_code = await build()
+    if status_code == status.HTTP_200_OK:
+        await cache.aset(key, data, timeout=settings.TODO_CACHE_TIMEOUT)
+    return render(data, status_code)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncTodoView(View):
+    """
+    Token-authenticated async view. Handlers receive a DRF `Request` so the
+    filters, pagination and serializers of the sync views apply unchanged.
+    """
+
+    authentication = CachedTokenAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[JSONParser()])
+        try:
+            request.user = await self.authenticate(request)
+            handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def authenticate(self, request):
+        auth = request.META.get("HTTP_AUTHORIZATION", "").split()
+        if not auth or auth[0].lower() != self.authentication.keyword.lower():
+            raise exceptions.NotAuthenticated()
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed("Invalid token header.")
+        with timer("auth"):
+            user, _ = await self.authentication.aauthenticate_credentials(auth[1])
+        return user
+
+    def handle_exception(self, exc):
+        headers = {}
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.status_code = status.HTTP_401_UNAUTHORIZED
+            headers["WWW-Authenticate"] = self.authentication.keyword
+        data = (
+            exc.detail
+            if isinstance(exc.detail, (list, dict))
+            else {"detail": exc.detail}
+        )
+        return render(data, exc.status_code, headers)
+
+
+class AsyncListTodoItemView(AsyncTodoView):
+    async def get(self, request):
+        etag, last_modified = await sync_to_async(list_fingerprint)(request)
+        return await aconditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: cached_response(request, lambda: self.list(request)),
+        )
+
+    async def list(self, request):
+        paginator = TimestampCursorPagination()
+        paginated = paginator.is_requested(request)
+        ordering = get_ordering(request.query_params)
+        if paginated and ordering not in (None, ["timestamp", "id"]):
+            raise exceptions.ValidationError(
+                {"ordering": ["Only timestamp ordering supports cursor pagination."]}
+            )
+        fields = get_sparse_fields(request.query_params)
+
+        queryset = filter_todo_items(
+            TodoItem.objects.filter(user=request.user), request.query_params
+        )
+        # the paginator builds its cursors from the timestamp
+        queryset = select_fields(
+            queryset, fields, required=["timestamp"] if paginated else []
+        )
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        if paginated:
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            todo_serializer = TodoItemSerializer(page, many=True, fields=fields)
+            data = paginator.get_paginated_response(todo_serializer.data).data
+            return data, status.HTTP_200_OK
+        todo_instances = [todo_instance async for todo_instance in queryset]
+        todo_serializer = TodoItemSerializer(todo_instances, many=True, fields=fields)
+        return todo_serializer.data, status.HTTP_200_OK
+
+
+class AsyncDetailTodoItemView(AsyncTodoView):
+    async def get(self, request, pk):
+        etag, last_modified = await sync_to_async(detail_fingerprint)(request, pk)
+        return await aconditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: cached_response(request, lambda: self.retrieve(request, pk)),
+        )
+
+    async def retrieve(self, request, pk):
+        try:
+            todo_instance = await TodoItem.objects.prefetch_related("tags").aget(
+                id=pk, user=request.user
+            )
+        except ObjectDoesNotExist as e:
+            return {"error": str(e)}, status.HTTP_404_NOT_FOUND
+        return TodoItemSerializer(todo_instance).data, status.HTTP_200_OK
+
+
+class AsyncCreateTodoItemView(AsyncTodoView):
+    async def post(self, request):
+        if not isinstance(request.data, dict):
+            raise exceptions.ParseError("Expected a todo item.")
+        data = dict(request.data)
+        if "due_date" in data:
+            try:
+                data["due_date"] = validate_due_date(data.get("due_date"))
+            except Exception as e:
+                return render({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+        tags_serializer = TodoItemTagsSerializer(data=data)
+        if not tags_serializer.is_valid():
+            return render(tags_serializer.errors, status.HTTP_400_BAD_REQUEST)
+        tags = tags_serializer.validated_data.get("tags", [])
+        data.pop("tags", None)
+        # set on save below; validating it would need a synchronous query
+        data.pop("user", None)
+        todo_serializer = TodoItemSerializer(data=data)
+        if not todo_serializer.is_valid():
+            return render(todo_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        todo_instance = await sync_to_async(self.perform_create)(
+            todo_serializer, request.user, tags
+        )
+        invalidate_user(request.user.pk)
+        publish(request.user.pk, "created", [todo_instance.pk])
+        return render(TodoItemSerializer(todo_instance).data, status.HTTP_201_CREATED)
+
+    def perform_create(self, todo_serializer, user, tags):
+        # the item and its tags become visible together
+        with transaction.atomic():
+            todo_instance = get_instance_with_tags(
+                todo_serializer.save(user=user), tags
+            )
+            return TodoItem.objects.prefetch_related("tags").get(pk=todo_instance.pk)
+
+
+class AsyncUpdateTodoItemView(AsyncTodoView):
+    async def put(self, request, pk):
+        return await self.update(request, pk, partial=False)
+
+    async def patch(self, request, pk):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial):
+        if not isinstance(request.data, dict):
+            raise exceptions.ParseError("Expected a todo item.")
+        data = dict(request.data)
+        if "due_date" in data:
+            try:
+                data["due_date"] = validate_due_date(data.get("due_date"))
+            except Exception as e:
+                return render({"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+        try:
+            todo_instance = await TodoItem.objects.aget(id=pk, user=request.user)
+        except ObjectDoesNotExist as e:
+            return render({"error": str(e)}, status.HTTP_404_NOT_FOUND)
+
+        # PUT replaces the tags (none given -> none kept), PATCH leaves them
+        # untouched unless "tags" is present.
+        tags_serializer = TodoItemTagsSerializer(data=data)
+        if not tags_serializer.is_valid():
+            return render(tags_serializer.errors, status.HTTP_400_BAD_REQUEST)
+        tags = tags_serializer.validated_data.get("tags", None if partial else [])
+        data.pop("tags", None)
+        data.pop("user", None)
+        todo_serializer = TodoItemSerializer(
+            instance=todo_instance, data=data, partial=partial
+        )
+        if not todo_serializer.is_valid():
+            return render(todo_serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        todo_instance = await sync_to_async(self.perform_update)(todo_serializer, tags)
+        invalidate_user(request.user.pk)
+        publish(request.user.pk, "updated", [todo_instance.pk])
+        return render(TodoItemSerializer(todo_instance).data)
+
+    def perform_update(self, todo_serializer, tags):
+        with transaction.atomic():
+            todo_instance = todo_serializer.save()
+            if tags is not None:
+                set_tags(todo_instance, tags)
+            return TodoItem.objects.prefetch_related("tags").get(pk=todo_instance.pk)
+
+
+class AsyncDeleteTodoItemView(AsyncTodoView):
+    async def delete(self, request, pk):
+        deleted = await sync_to_async(self.perform_delete)(request.user, pk)
+        if not deleted:
+            return render(
+                {"error": "TodoItem matching query does not exist."},
+                status.HTTP_404_NOT_FOUND,
+            )
+        invalidate_user(request.user.pk)
+        publish(request.user.pk, "deleted", [pk])
+        return render({"message": f"Item {pk} deleted successfully!"})
+
+    def perform_delete(self, user, pk):
+        # the item and its tombstone change together
+        with transaction.atomic():
+            deleted, _ = TodoItem.objects.filter(id=pk, user=user).delete()
+            if deleted:
+                record_deletions(user.pk, [pk])
+            return deleted
+
+
+class AsyncEventsView(AsyncTodoView):
+    """
+    Server-Sent Events announcing the requesting user's created, updated and
+    deleted todo items, see events.py.
+
+    The stream opens with a `retry:` line once the subscription is in place;
+    clients sync from then on and again after a `reset` event, which ends the
+    stream. An idle stream only costs its queue and a timer for the next
+    heartbeat comment. Streams end after `TODO_EVENTS_MAX_AGE` seconds, since
+    Django does not stop them when the client goes away.
+    """
+
+    async def get(self, request):
+        if not isinstance(request._request, ASGIRequest):
+            return render(
+                {"error": "Events are only served by the ASGI application."},
+                status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        response = StreamingHttpResponse(
+            self.stream(request.user.pk), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # keep proxies like nginx from buffering the stream
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self, user_id):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.TODO_EVENTS_MAX_AGE
+        hub = get_hub()
+        subscription = hub.subscribe(user_id)
+        try:
+            yield f"retry: {settings.TODO_EVENTS_RETRY * 1000}\n\n"
+            while (remaining := deadline - loop.time()) > 0:
+                try:
+                    event = await subscription.get(
+                        min(settings.TODO_EVENTS_HEARTBEAT, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    # keeps the connection open through idle-closing proxies
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_event(event)
+                if event == RESET:
+                    return
+        finally:
+            hub.unsubscribe(user_id, subscription)
@@ -0,0 +1,103 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import get_cache
+from .metrics import timer
+
+
+class LocalTTLCache:
+    """
+    A small thread-safe LRU whose entries also expire after `ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_tokens = LocalTTLCache(
+    maxsize=settings.TODO_TOKEN_CACHE_SIZE, ttl=settings.TODO_TOKEN_CACHE_LOCAL_TTL
+)
+
+
+def token_cache_key(key):
+    # never put raw tokens into a shared cache
+    return f"todo:token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def evict_token(key):
+    """
+    Forget the cached resolution of token `key` in this process and in the
+    shared cache. Other processes drop it once their local TTL runs out.
+    """
+    local_tokens.delete(key)
+    get_cache().delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` that resolves tokens from an in-process LRU, then
+    the shared Django cache, and only then the database.
+    """
+
+    def authenticate(self, request):
+        with timer("auth"):
+            return super().authenticate(request)
+
+    def authenticate_credentials(self, key):
+        credentials = local_tokens.get(key)
+        if credentials is not None:
+            return credentials
+
+        shared_key = token_cache_key(key)
+        credentials = get_cache().get(shared_key)
+        if credentials is None:
+            # raises AuthenticationFailed for unknown keys and inactive users
+            credentials = super().authenticate_credentials(key)
+            get_cache().set(
+                shared_key, credentials, timeout=settings.TODO_TOKEN_CACHE_TIMEOUT
+            )
+        local_tokens.set(key, credentials)
+        return credentials
+
+    async def aauthenticate_credentials(self, key):
+        # local hits need no thread hop; anything else may query the database
+        credentials = local_tokens.get(key)
+        if credentials is not None:
+            return credentials
+        return await sync_to_async(self.authenticate_credentials)(key)
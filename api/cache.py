@@ -0,0 +1,79 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[settings.TODO_CACHE_ALIAS]
+
+
+def version_key(user_id):
+    return f"todo:version:{user_id}"
+
+
+def get_user_version(user_id):
+    """
+    Return the current cache version of `user_id`.
+
+    A missing counter starts from the current time rather than 1, so entries
+    written under a counter that has since been evicted can never match again.
+    """
+    cache = get_cache()
+    key = version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user(user_id):
+    """Drop every cached response of `user_id` by bumping its version."""
+    try:
+        get_cache().incr(version_key(user_id))
+    except ValueError:
+        # no counter yet, so nothing has been cached for this user
+        pass
+
+
+def response_cache_key(request):
+    user_id = request.user.pk
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"todo:response:{user_id}:{get_user_version(user_id)}:{path}"
+
+
+def record(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"]}
+
+
+def cached_response(request, build):
+    """
+    Return the cached response for this user and path, or call `build()` and
+    cache its data when it answers 200.
+    """
+    cache = get_cache()
+    key = response_cache_key(request)
+    data = cache.get(key)
+    if data is not None:
+        record("hits")
+        return Response(data)
+
+    record("misses")
+    response = build()
+    if response.status_code == 200:
+        cache.set(key, response.data, timeout=settings.TODO_CACHE_TIMEOUT)
+    return response
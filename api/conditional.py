@@ -0,0 +1,107 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from .cache import get_cache, get_user_version
+from .models import TodoItem
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+    # weak: the same data may be sent with a different content encoding
+    return f'W/"{digest}"'
+
+
+def cached_fingerprint(user_id, name, compute):
+    # Stored under the user's cache version, so any write that invalidates the
+    # cached responses also invalidates the fingerprint.
+    cache = get_cache()
+    key = f"todo:fingerprint:{user_id}:{get_user_version(user_id)}:{name}"
+    fingerprint = cache.get(key)
+    if fingerprint is None:
+        fingerprint = compute()
+        cache.set(key, fingerprint, timeout=settings.TODO_CACHE_TIMEOUT)
+    return fingerprint
+
+
+def list_fingerprint(request):
+    """
+    Return `(etag, None)` for the todo list of `request.user`.
+
+    One indexed aggregate: max(updated_at) catches creates and edits and the
+    row count catches deletes. The full path is mixed into the ETag because
+    filters, fields and cursors change the body. There is no Last-Modified:
+    deleting an item leaves max(updated_at) as it was, so `If-Modified-Since`
+    would answer 304 for a list that lost items.
+    """
+    fingerprint = cached_fingerprint(
+        request.user.pk,
+        "list",
+        lambda: TodoItem.objects.filter(user=request.user).aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        ),
+    )
+    last_modified = fingerprint["last_modified"]
+    etag = make_etag(
+        request.user.pk,
+        last_modified and last_modified.isoformat(),
+        fingerprint["count"],
+        request.get_full_path(),
+    )
+    return etag, None
+
+
+def detail_fingerprint(request, pk):
+    """
+    Return `(etag, last_modified)` for one todo, or `(None, None)` when the
+    user has no such item.
+    """
+
+    def compute():
+        todos = TodoItem.objects.filter(id=pk, user=request.user)
+        # "" marks a missing item, None would never be cached
+        return todos.values_list("updated_at", flat=True).first() or ""
+
+    last_modified = cached_fingerprint(request.user.pk, f"detail:{pk}", compute)
+    if not last_modified:
+        return None, None
+    etag = make_etag(request.user.pk, pk, last_modified.isoformat())
+    return etag, last_modified
+
+
+def conditional_response(request, etag, last_modified, build):
+    """
+    Answer `If-None-Match`/`If-Modified-Since` with 304 before `build()` runs,
+    otherwise return its response with validators attached.
+    """
+    if etag is None:
+        return build()
+
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    response = not_modified if not_modified is not None else build()
+    return add_validators(response, etag, timestamp)
+
+
+async def aconditional_response(request, etag, last_modified, build):
+    """conditional_response() for a coroutine function `build`."""
+    if etag is None:
+        return await build()
+
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    response = not_modified if not_modified is not None else await build()
+    return add_validators(response, etag, timestamp)
+
+
+def add_validators(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        # per-user data: let clients keep it, but always revalidate
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
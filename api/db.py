@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .metrics import record_query
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply `TODO_SQLITE_PRAGMAS` to every new SQLite connection. Most PRAGMAs
+    only last as long as the connection; `journal_mode=WAL` is stored in the
+    database file.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.TODO_SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    # the same wrapper object survives reconnects, so only add it once
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
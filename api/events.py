@@ -0,0 +1,108 @@
+"""
+Change notifications for the Server-Sent Events stream at todo/events/.
+
+The write views publish a `created`, `updated` or `deleted` event with the
+item id to its owner; clients then fetch what changed, e.g. with a delta
+sync. Events go through the hub named by `TODO_EVENTS_BACKEND`. The default
+LocalHub only reaches streams served by the same process, so deployments
+with several workers plug in a backend that fans out through a shared
+broker. A backend provides
+
+- `publish(user_id, event)`, callable from any thread,
+- `subscribe(user_id)`, called on the event loop serving the stream, which
+  returns a subscription whose `async get(timeout)` returns the next event or
+  raises `asyncio.TimeoutError`, and
+- `unsubscribe(user_id, subscription)`.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .renderers import FastJSONRenderer
+
+# tells a client it missed events and has to sync again
+RESET = {"type": "reset"}
+
+
+class Subscription:
+    """One stream's queue, living on the event loop that serves the stream."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def push(self, event):
+        # asyncio queues are not thread-safe, so hand the event to their loop
+        try:
+            self.loop.call_soon_threadsafe(self.put, event)
+        except RuntimeError:
+            # the loop is closed, the stream is gone
+            pass
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # the client does not keep up: drop the backlog, it has to resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESET)
+
+    async def get(self, timeout):
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class LocalHub:
+    """Publish to the streams of this process only."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def publish(self, user_id, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(
+            asyncio.get_running_loop(), settings.TODO_EVENTS_QUEUE_SIZE
+        )
+        with self.lock:
+            self.subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self.lock:
+            self.subscriptions[user_id].discard(subscription)
+            if not self.subscriptions[user_id]:
+                del self.subscriptions[user_id]
+
+
+@lru_cache
+def load_hub(backend):
+    return import_string(backend)()
+
+
+def get_hub():
+    return load_hub(settings.TODO_EVENTS_BACKEND)
+
+
+def publish(user_id, event_type, todo_ids):
+    """Tell `user_id`'s streams that the items `todo_ids` were `event_type`."""
+    hub = get_hub()
+    for todo_id in todo_ids:
+        hub.publish(user_id, {"type": event_type, "id": todo_id})
+
+
+def format_event(event):
+    """Return `event` as a Server-Sent Events message."""
+    event = dict(event)
+    event_type = event.pop("type")
+    data = FastJSONRenderer().render(event).decode()
+    return f"event: {event_type}\ndata: {data}\n\n"
@@ -0,0 +1,104 @@
+from datetime import date
+
+from rest_framework.exceptions import ValidationError
+
+from .models import TodoItem
+
+STATUSES = [choice for choice, _ in TodoItem.STATUS_CHOICES]
+
+ORDERING_FIELDS = ["timestamp", "due_date", "title", "status", "id"]
+
+SPARSE_FIELDS = [
+    "id",
+    "tags",
+    "title",
+    "timestamp",
+    "description",
+    "due_date",
+    "status",
+    "user",
+]
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_date(query_params, name):
+    try:
+        return date.fromisoformat(query_params[name])
+    except ValueError:
+        raise ValidationError({name: ["Expected a date formatted as YYYY-MM-DD."]})
+
+
+def filter_todo_items(queryset, query_params):
+    """
+    Narrow `queryset` by the `status`, `tag`, `due_after` and `due_before`
+    query parameters. Several statuses may be comma separated; repeating
+    `tag` requires every given tag.
+    """
+    if "status" in query_params:
+        statuses = parse_list(query_params["status"])
+        invalid = [value for value in statuses if value not in STATUSES]
+        if invalid:
+            raise ValidationError(
+                {"status": [f'"{value}" is not a valid choice.' for value in invalid]}
+            )
+        queryset = queryset.filter(status__in=statuses)
+
+    # one join per tag; (todoitem, tag) is unique so rows never repeat
+    for tag in query_params.getlist("tag"):
+        queryset = queryset.filter(tags__title=tag)
+
+    if "due_after" in query_params:
+        queryset = queryset.filter(due_date__gte=parse_date(query_params, "due_after"))
+    if "due_before" in query_params:
+        queryset = queryset.filter(due_date__lte=parse_date(query_params, "due_before"))
+    return queryset
+
+
+def get_ordering(query_params):
+    """
+    Return the `order_by()` arguments for the `ordering` query parameter, or
+    None when it is absent. `id` is always appended as a tie-breaker.
+    """
+    if "ordering" not in query_params:
+        return None
+    ordering = parse_list(query_params["ordering"])
+    invalid = [value for value in ordering if value.lstrip("-") not in ORDERING_FIELDS]
+    if invalid or not ordering:
+        raise ValidationError(
+            {"ordering": [f"Expected a comma separated subset of {ORDERING_FIELDS}."]}
+        )
+    if not any(value.lstrip("-") == "id" for value in ordering):
+        ordering.append("-id" if ordering[0].startswith("-") else "id")
+    return ordering
+
+
+def get_sparse_fields(query_params):
+    """
+    Return the field names requested with `fields=`, or None for all fields.
+    """
+    if "fields" not in query_params:
+        return None
+    fields = parse_list(query_params["fields"])
+    invalid = [field for field in fields if field not in SPARSE_FIELDS]
+    if invalid or not fields:
+        raise ValidationError(
+            {"fields": [f"Expected a comma separated subset of {SPARSE_FIELDS}."]}
+        )
+    return fields
+
+
+def select_fields(queryset, fields, required=()):
+    """
+    Restrict `queryset` to the columns behind `fields` (plus `required`), and
+    only prefetch tags when they were asked for.
+    """
+    if fields is None:
+        return queryset.prefetch_related("tags")
+    columns = [field for field in fields if field != "tags"]
+    queryset = queryset.only(*columns, *required)
+    if "tags" in fields:
+        queryset = queryset.prefetch_related("tags")
+    return queryset
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with cost parameters from settings. The defaults follow the
+    OWASP minimum (19 MiB, 2 passes, 1 lane), far cheaper per login than
+    Django's 100 MiB / 8 lanes while still memory-hard.
+    """
+
+    time_cost = settings.TODO_ARGON2_TIME_COST
+    memory_cost = settings.TODO_ARGON2_MEMORY_COST
+    parallelism = settings.TODO_ARGON2_PARALLELISM
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """
+    scrypt with cost parameters from settings.
+    """
+
+    work_factor = settings.TODO_SCRYPT_WORK_FACTOR
+    block_size = settings.TODO_SCRYPT_BLOCK_SIZE
+    parallelism = settings.TODO_SCRYPT_PARALLELISM
@@ -0,0 +1,100 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.cache import invalidate_user
+from api.models import TodoItem
+from api.stats import refresh_status_counts
+
+PENDING_STATUSES = ["OPEN", "WORKING"]
+
+
+def overdue_items(today):
+    # served by todo_status_due_date_idx
+    return TodoItem.objects.filter(status__in=PENDING_STATUSES, due_date__lt=today)
+
+
+def mark_overdue_chunk(today, chunk_size):
+    """
+    Mark up to `chunk_size` past-due items OVERDUE in one transaction.
+    Returns how many items were selected and marked, and their owners.
+    """
+    with transaction.atomic():
+        # unordered, so the LIMIT stops the index scan early
+        rows = list(overdue_items(today).values_list("id", "user_id")[:chunk_size])
+        if not rows:
+            return 0, 0, set()
+        # repeating the conditions keeps items changed since the SELECT as they are
+        marked = (
+            overdue_items(today)
+            .filter(id__in=[pk for pk, _ in rows])
+            .update(status="OVERDUE", updated_at=timezone.now())
+        )
+    return len(rows), marked, {user_id for _, user_id in rows if user_id is not None}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark every OPEN or WORKING todo item due before today as OVERDUE. "
+        "Safe to run repeatedly, e.g. daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.TODO_OVERDUE_CHUNK_SIZE,
+            help="items updated per transaction",
+        )
+        parser.add_argument(
+            "--date",
+            dest="today",
+            help="treat this day (YYYY-MM-DD) as today",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="only count the items that would be marked",
+        )
+
+    def handle(self, *args, chunk_size, today=None, dry_run=False, **options):
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size must be positive.")
+        today = self.parse_date(today) if today else timezone.localdate()
+
+        if dry_run:
+            pending = overdue_items(today)
+            count = pending.count()
+            users = pending.values("user_id").distinct().count()
+            self.stdout.write(f"{count} items of {users} users are due before {today}.")
+            return
+
+        total, chunks, user_ids = 0, 0, set()
+        while True:
+            selected, marked, chunk_user_ids = mark_overdue_chunk(today, chunk_size)
+            if not selected:
+                break
+            total += marked
+            chunks += 1
+            user_ids |= chunk_user_ids
+            # update() sends no signals, so recount and drop the cached
+            # responses here
+            refresh_status_counts(chunk_user_ids)
+            for user_id in chunk_user_ids:
+                invalidate_user(user_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Marked {total} items of {len(user_ids)} users overdue "
+                f"in {chunks} chunks."
+            )
+        )
+
+    def parse_date(self, value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            raise CommandError("--date must be formatted as YYYY-MM-DD.")
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import TodoTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of todo items deleted more than "
+        "TODO_SYNC_RETENTION_DAYS ago; sync cursors that old are refused anyway."
+    )
+
+    def handle(self, *args, **options):
+        retention = timedelta(days=settings.TODO_SYNC_RETENTION_DAYS)
+        deleted, _ = TodoTombstone.objects.filter(
+            deleted_at__lt=timezone.now() - retention
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstones."))
@@ -0,0 +1,155 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# timings of the request being handled, see api.middleware.PerformanceMiddleware
+current_timings = ContextVar("current_timings", default=None)
+
+
+class RequestTimings:
+    """Time spent per component (seconds) and queries run by one request."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.queries = 0
+
+
+@contextmanager
+def timer(name):
+    """Add the time spent in the block to `name` of the current request."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    # installed on every connection by api.db; a no-op outside of requests
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.durations["db"] += time.perf_counter() - start
+        timings.queries += 1
+
+
+class Histogram:
+    """
+    A Prometheus-style histogram with fixed upper bounds, one series per
+    label tuple.
+    """
+
+    def __init__(self, name, documentation, label_names, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = list(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                # one count per bucket plus +Inf, then the sum
+                series = self.series[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def clear(self):
+        with self.lock:
+            self.series.clear()
+
+    def expose(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self.lock:
+            series = {labels: list(values) for labels, values in self.series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = ",".join(
+                f'{name}="{value}"' for name, value in zip(self.label_names, labels)
+            )
+            cumulative = 0
+            for bound, count in zip(self.buckets + ["+Inf"], values):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-1]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+LABELS = ("method", "route", "status")
+
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HISTOGRAMS = {
+    "request": Histogram(
+        "todo_request_duration_seconds",
+        "Time spent handling requests.",
+        LABELS,
+        SECONDS,
+    ),
+    "db": Histogram(
+        "todo_request_db_duration_seconds",
+        "Time spent in database queries per request.",
+        LABELS,
+        SECONDS,
+    ),
+    "serialize": Histogram(
+        "todo_request_serialize_duration_seconds",
+        "Time spent serializing todo items per request.",
+        LABELS,
+        SECONDS,
+    ),
+    "auth": Histogram(
+        "todo_request_auth_duration_seconds",
+        "Time spent authenticating tokens per request.",
+        LABELS,
+        SECONDS,
+    ),
+    "queries": Histogram(
+        "todo_request_db_queries",
+        "Database queries per request.",
+        LABELS,
+        (0, 1, 2, 3, 5, 10, 25, 50, 100),
+    ),
+    "size": Histogram(
+        "todo_response_size_bytes",
+        "Size of non-streaming response bodies.",
+        LABELS,
+        (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000),
+    ),
+}
+
+
+def observe(labels, timings, duration, size):
+    HISTOGRAMS["request"].observe(labels, duration)
+    for name in ("db", "serialize", "auth"):
+        HISTOGRAMS[name].observe(labels, timings.durations.get(name, 0.0))
+    HISTOGRAMS["queries"].observe(labels, timings.queries)
+    if size is not None:
+        HISTOGRAMS["size"].observe(labels, size)
+
+
+def expose_metrics():
+    """Render every histogram in the Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines.extend(histogram.expose())
+    return "\n".join(lines) + "\n"
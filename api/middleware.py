@@ -0,0 +1,232 @@
+import logging
+import time
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from .metrics import RequestTimings, current_timings, observe, timer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("api.performance")
+
+
+class PerformanceMiddleware:
+    """
+    Measure every request: wall time, database queries and their time (see
+    `api.metrics.record_query`), serializer and authentication time, and
+    response size.
+
+    The figures go to the `Server-Timing` header (when
+    `TODO_SERVER_TIMING` is on), an `api.performance` log line and the
+    histograms served at /api/metrics/. Works for sync and async views
+    alike, without a thread hop for either.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        self.process_timings(request, response, timings, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        self.process_timings(request, response, timings, time.perf_counter() - start)
+        return response
+
+    def process_timings(self, request, response, timings, duration):
+        match = request.resolver_match
+        # the route pattern, not the path, keeps the number of series bounded
+        route = match.route if match is not None else "unmatched"
+        size = None if response.streaming else len(response.content)
+        observe((request.method, route, response.status_code), timings, duration, size)
+
+        if settings.TODO_SERVER_TIMING:
+            durations = dict(timings.durations)
+            db = durations.pop("db", 0.0)
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"app;dur={duration * 1000:.2f}",
+                    f'db;dur={db * 1000:.2f};desc="{timings.queries} queries"',
+                ]
+                + [
+                    f"{name};dur={seconds * 1000:.2f}"
+                    for name, seconds in durations.items()
+                ]
+            )
+
+        if logger.isEnabledFor(logging.INFO):
+            fields = {
+                "method": request.method,
+                "path": request.path,
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "db_queries": timings.queries,
+                "db_ms": round(timings.durations.get("db", 0.0) * 1000, 2),
+                "serialize_ms": round(
+                    timings.durations.get("serialize", 0.0) * 1000, 2
+                ),
+                "auth_ms": round(timings.durations.get("auth", 0.0) * 1000, 2),
+                "bytes": size,
+            }
+            logger.info(
+                " ".join(f"{key}={value}" for key, value in fields.items()),
+                extra={"performance": fields},
+            )
+
+
+class GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self):
+        # wbits 31 writes a gzip header and trailer
+        self.compressor = zlib.compressobj(settings.TODO_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=settings.TODO_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+def accepted_encodings(header):
+    """Return the content codings `header` (Accept-Encoding) allows."""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        try:
+            quality = float(params.strip().removeprefix("q=")) if params else 1.0
+        except ValueError:
+            quality = 1.0
+        if name and quality > 0:
+            accepted.add(name)
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli (when the optional brotli package is
+    installed) or gzip, as the client's Accept-Encoding allows.
+
+    Only content types in `TODO_COMPRESSION_TYPES` are compressed, and only
+    bodies of at least `TODO_COMPRESSION_MIN_SIZE` bytes, since compressing
+    small ones costs more time than it saves. Streaming responses (the NDJSON
+    export) are compressed chunk by chunk, each chunk flushed so clients can
+    read the stream as it arrives.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def get_compressor(self, request):
+        accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return BrotliCompressor()
+        if "gzip" in accepted:
+            return GzipCompressor()
+        return None
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        if (
+            not settings.TODO_COMPRESSION
+            or content_type not in settings.TODO_COMPRESSION_TYPES
+            or response.has_header("Content-Encoding")
+            or (
+                not response.streaming
+                and len(response.content) < settings.TODO_COMPRESSION_MIN_SIZE
+            )
+        ):
+            return response
+
+        # the body now depends on Accept-Encoding, also for caches
+        patch_vary_headers(response, ["Accept-Encoding"])
+        compressor = self.get_compressor(request)
+        if compressor is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.acompress_stream(
+                    compressor, response.streaming_content
+                )
+            else:
+                response.streaming_content = self.compress_stream(
+                    compressor, response.streaming_content
+                )
+            del response["Content-Length"]
+        else:
+            with timer("compress"):
+                compressed = compressor.compress(response.content) + compressor.finish()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = compressor.encoding
+        return response
+
+    def compress_stream(self, compressor, chunks):
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+
+    async def acompress_stream(self, compressor, chunks):
+        async for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
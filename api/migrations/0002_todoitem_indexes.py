@@ -0,0 +1,45 @@
+# Generated by Django 4.2.9 on 2026-10-18 02:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="todoitem",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["user", "timestamp", "id"], name="todo_user_timestamp_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(fields=["user", "status"], name="todo_user_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["user", "due_date"], name="todo_user_due_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(fields=["timestamp", "id"], name="todo_timestamp_idx"),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.9 on 2026-10-18 03:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0002_todoitem_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todoitem",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["user", "updated_at"], name="todo_user_updated_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Full-text search index over TodoItem.title and description, see api.search.
+#
+# SQLite gets an external-content FTS5 table kept in sync by triggers, so
+# bulk_create(), update() and cascading deletes are indexed too. Note that a
+# later migration which makes Django rebuild api_todoitem on SQLite (most
+# AlterField/RemoveField operations) drops these triggers and has to
+# recreate them.
+#
+# PostgreSQL gets a GIN index over the same SearchVector expression that
+# api.search queries, so the planner can use it. Other databases get nothing
+# and api.search falls back to substring matching.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # user_id is indexed as a token so the user scope is part of the MATCH;
+    # prefix indexes serve search-as-you-type, see api.search.fts5_queries
+    """
+    CREATE VIRTUAL TABLE api_todoitem_fts USING fts5(
+        title, description, user_id,
+        content='api_todoitem', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """,
+    """
+    CREATE TRIGGER api_todoitem_fts_insert AFTER INSERT ON api_todoitem BEGIN
+        INSERT INTO api_todoitem_fts (rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_todoitem_fts_delete AFTER DELETE ON api_todoitem BEGIN
+        INSERT INTO api_todoitem_fts (api_todoitem_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER api_todoitem_fts_update
+    AFTER UPDATE OF title, description, user_id ON api_todoitem BEGIN
+        INSERT INTO api_todoitem_fts (api_todoitem_fts, rowid, title, description, user_id)
+        VALUES ('delete', old.id, old.title, old.description, old.user_id);
+        INSERT INTO api_todoitem_fts (rowid, title, description, user_id)
+        VALUES (new.id, new.title, new.description, new.user_id);
+    END
+    """,
+    "INSERT INTO api_todoitem_fts (api_todoitem_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS api_todoitem_fts_update",
+    "DROP TRIGGER IF EXISTS api_todoitem_fts_delete",
+    "DROP TRIGGER IF EXISTS api_todoitem_fts_insert",
+    "DROP TABLE IF EXISTS api_todoitem_fts",
+]
+
+
+def postgresql_search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # must stay identical to the vector in api.search.postgresql_search()
+    return GinIndex(
+        SearchVector("title", "description", config="english"),
+        name="todo_search_idx",
+    )
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        TodoItem = apps.get_model("api", "TodoItem")
+        schema_editor.add_index(TodoItem, postgresql_search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        TodoItem = apps.get_model("api", "TodoItem")
+        schema_editor.remove_index(TodoItem, postgresql_search_index())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0003_todoitem_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-18 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0004_todoitem_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todoitem",
+            index=models.Index(
+                fields=["status", "due_date"], name="todo_status_due_date_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.9 on 2026-10-18 03:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("api", "0005_todoitem_status_due_date_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("OPEN", "Open"),
+                            ("WORKING", "Working"),
+                            ("DONE", "Done"),
+                            ("OVERDUE", "Overdue"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="todostatuscount",
+            constraint=models.UniqueConstraint(
+                fields=("user", "status"), name="todo_status_count_unique"
+            ),
+        ),
+    ]
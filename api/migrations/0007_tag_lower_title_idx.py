@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-18 03:55
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0006_todostatuscount"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                django.db.models.functions.text.Lower("title"),
+                models.F("title"),
+                name="tag_lower_title_idx",
+            ),
+        ),
+    ]
@@ -1,10 +1,18 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
 class Tag(models.Model):
     title = models.CharField(max_length=50, unique=True)
 
+    class Meta:
+        indexes = [
+            # case-insensitive prefix ranges for autocomplete, see api.tags
+            models.Index(Lower("title"), "title", name="tag_lower_title_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -19,11 +27,71 @@ class TodoItem(models.Model):
 
     title = models.CharField(max_length=100)
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     description = models.TextField(max_length=1000, blank=True)
     due_date = models.DateField(blank=True, null=True)
-    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True)
+    # Indexed through the composite indexes below, which all lead with user.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, db_index=False)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="OPEN")
     tags = models.ManyToManyField("Tag", blank=True)
 
+    class Meta:
+        indexes = [
+            # per-user listings, keyset-paginated on (timestamp, id)
+            models.Index(
+                fields=["user", "timestamp", "id"], name="todo_user_timestamp_idx"
+            ),
+            models.Index(fields=["user", "status"], name="todo_user_status_idx"),
+            models.Index(fields=["user", "due_date"], name="todo_user_due_date_idx"),
+            # conditional requests: max(updated_at) per user
+            models.Index(
+                fields=["user", "updated_at"], name="todo_user_updated_at_idx"
+            ),
+            # todo/all/ keyset pagination across every user
+            models.Index(fields=["timestamp", "id"], name="todo_timestamp_idx"),
+            # the mark_overdue command. Not a partial index: SQLite only uses
+            # those when the query repeats the condition with literal values.
+            models.Index(
+                fields=["status", "due_date"], name="todo_status_due_date_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class TodoStatusCount(models.Model):
+    """
+    Number of a user's todo items per status, kept up to date by api.stats
+    while `TODO_STATS_COUNTERS` is on.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    status = models.CharField(max_length=10, choices=TodoItem.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "status"], name="todo_status_count_unique"
+            )
+        ]
+
+
+class TodoTombstone(models.Model):
+    """
+    A deleted todo item, so delta syncs can tell clients about it; written
+    by the delete views and pruned by the prune_tombstones command.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    todo_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # deletions since a sync cursor, see api.sync
+            models.Index(
+                fields=["user", "deleted_at"], name="tombstone_user_deleted_idx"
+            ),
+        ]
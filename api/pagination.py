@@ -0,0 +1,184 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TodoPagination(BasePagination):
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "TODO_PAGE_SIZE", 100)
+        self.max_page_size = getattr(settings, "TODO_MAX_PAGE_SIZE", 1000)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+class TimestampCursorPagination(TodoPagination):
+    """
+    Keyset pagination over `(timestamp, id)`.
+
+    Each page is fetched with a `WHERE (timestamp, id) > cursor` filter and a
+    `LIMIT`, so page N costs the same as page 1. Cursors are opaque to clients.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def is_requested(self, request):
+        # Pagination is opt-in so existing clients keep receiving a plain list.
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def encode_cursor(self, instance, reverse):
+        payload = {"t": instance.timestamp.isoformat(), "i": instance.pk, "r": reverse}
+        encoded = urlsafe_b64encode(json.dumps(payload).encode("ascii"))
+        return encoded.decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            return (
+                bool(payload["r"]),
+                datetime.fromisoformat(payload["t"]),
+                int(payload["i"]),
+            )
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            self.reverse = False
+            queryset = queryset.order_by("timestamp", "id")
+        else:
+            self.reverse, timestamp, pk = self.cursor
+            # The leading timestamp bound lets the (.., timestamp, id) indexes
+            # seek straight to the cursor instead of scanning from the start.
+            if self.reverse:
+                queryset = queryset.filter(
+                    Q(timestamp__lte=timestamp)
+                    & (Q(timestamp__lt=timestamp) | Q(id__lt=pk))
+                ).order_by("-timestamp", "-id")
+            else:
+                queryset = queryset.filter(
+                    Q(timestamp__gte=timestamp)
+                    & (Q(timestamp__gt=timestamp) | Q(id__gt=pk))
+                ).order_by("timestamp", "id")
+
+        # Fetch one extra row to learn whether there is a further page.
+        return queryset[: self.page_size + 1]
+
+    def get_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        if self.reverse:
+            has_next, has_previous = self.cursor is not None, has_more
+        else:
+            has_next, has_previous = has_more, self.cursor is not None
+
+        self.next_cursor = (
+            self.encode_cursor(results[-1], False) if has_next and results else None
+        )
+        self.previous_cursor = (
+            self.encode_cursor(results[0], True) if has_previous and results else None
+        )
+        return results
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.get_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.get_page([instance async for instance in page_queryset])
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self.get_link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self.get_link(self.previous_cursor)
+
+
+class SearchPagination(TodoPagination):
+    """
+    Page-number pagination for ranked search results, which have no stable
+    key to seek on. Pages are fetched with `LIMIT`/`OFFSET`.
+    """
+
+    page_query_param = "page"
+
+    def get_page_number(self, request):
+        try:
+            page = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound("Invalid page.")
+        if page <= 0:
+            raise NotFound("Invalid page.")
+        return page
+
+    def get_limits(self, request):
+        """
+        Return the `(offset, limit)` to fetch for `request`; one row more than
+        a page, to learn whether there is a further page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.page = self.get_page_number(request)
+        return (self.page - 1) * self.page_size, self.page_size + 1
+
+    def get_page(self, results):
+        self.has_next = len(results) > self.page_size
+        return results[: self.page_size]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page + 1)
+
+    def get_previous_link(self):
+        if self.page == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page - 1)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    DRF's JSONRenderer, with the same output, encoding with orjson or a
+    shared stdlib encoder as `TODO_JSON_BACKEND` says.
+
+    Values orjson would format differently from DRF's JSONEncoder (datetimes,
+    Decimals, lazy strings, ...) are handed to that encoder's `default()`.
+    Indented output and non-default UNICODE_JSON/COMPACT_JSON/STRICT_JSON
+    settings go through DRF's own implementation.
+    """
+
+    # DRF builds a new JSONEncoder for every response, this one is reused
+    encoder = encoders.JSONEncoder(
+        ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    )
+    orjson_options = 0
+    if orjson is not None:
+        orjson_options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (
+            indent is not None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if settings.TODO_JSON_BACKEND == "orjson" and orjson is not None:
+            try:
+                ret = orjson.dumps(
+                    data, default=self.encoder.default, option=self.orjson_options
+                )
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits, which the stdlib handles
+                ret = self.encoder.encode(data).encode()
+        else:
+            ret = self.encoder.encode(data).encode()
+        # like DRF, escape the separators that are invalid in JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,103 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import TodoItem
+
+TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(text):
+    """Split a free-form query into words; punctuation and operators are ignored."""
+    return TERM_RE.findall(text)
+
+
+def fts5_queries(user_id, terms):
+    """
+    Build the FTS5 MATCH expressions for `user_id`'s items with every term in
+    the title, and for the remaining items with every term in the title or
+    description.
+
+    While the last term is 2-4 characters long it also matches as a prefix,
+    so results show up as a word is typed. Those prefixes have their own
+    index; longer ones would merge the postings of every completion across
+    all users, so from then on the (stemmed) word has to match.
+    """
+    phrases = " ".join(f'"{term}"' for term in terms)
+    if 1 < len(terms[-1]) <= 4:
+        phrases += "*"
+    user = f'user_id : "{user_id}"'
+    return (
+        f"{user} AND title : ({phrases})",
+        f"{user} AND {{title description}} : ({phrases}) NOT title : ({phrases})",
+    )
+
+
+def sqlite_search(user, terms, offset, limit):
+    # bm25() would count every row holding each term across all users, which
+    # takes ~70 ms per common word on a million rows. Intersecting the user's
+    # token with the terms is cheap, so rank by where the terms occur instead:
+    # title matches first, then newest first.
+    table = f"{TodoItem._meta.db_table}_fts"
+    sql = (
+        f"SELECT rowid FROM ("
+        f"SELECT rowid, 0 AS tier FROM {table} WHERE {table} MATCH %s "
+        f"UNION ALL "
+        f"SELECT rowid, 1 AS tier FROM {table} WHERE {table} MATCH %s"
+        f") ORDER BY tier, rowid DESC LIMIT %s OFFSET %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*fts5_queries(user.pk, terms), limit, offset])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def postgresql_search(user, terms, offset, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    # must stay identical to todo_search_idx in migration 0004, see
+    # postgresql_search_index() there
+    vector = SearchVector("title", "description", config="english")
+    query = SearchQuery(" ".join(terms), config="english")
+    queryset = (
+        TodoItem.objects.filter(user=user)
+        .annotate(search=vector)
+        .filter(search=query)
+        .annotate(rank=SearchRank(vector, query))
+        .order_by("-rank", "id")
+    )
+    end = offset + limit
+    return list(queryset.values_list("id", flat=True)[offset:end])
+
+
+def fallback_search(user, terms, offset, limit):
+    # unindexed: only meant for databases without a full-text index
+    queryset = TodoItem.objects.filter(user=user).filter(
+        reduce(
+            and_,
+            (
+                Q(title__icontains=term) | Q(description__icontains=term)
+                for term in terms
+            ),
+        )
+    )
+    queryset = queryset.order_by("-timestamp", "-id")
+    end = offset + limit
+    return list(queryset.values_list("id", flat=True)[offset:end])
+
+
+def search_todo_ids(user, text, offset, limit):
+    """
+    Return the ids of `user`'s todo items matching every word of `text`, best
+    match first.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    if connection.vendor == "sqlite":
+        return sqlite_search(user, terms, offset, limit)
+    if connection.vendor == "postgresql":
+        return postgresql_search(user, terms, offset, limit)
+    return fallback_search(user, terms, offset, limit)
@@ -1,4 +1,6 @@
+from django.utils import timezone
 from rest_framework import serializers
+from .metrics import timer
 from .models import Tag, User, TodoItem
 
 
@@ -27,18 +29,145 @@ class TagSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class TagUsageSerializer(serializers.ModelSerializer):
+    # set by api.tags.with_usage
+    usage = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Tag
+        fields = ["id", "title", "usage"]
+
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timer("serialize"):
+            return super().data
+
+
 class TodoItemSerializer(serializers.ModelSerializer):
-    # required=False -----> IMPORTANT!!, otherwise code=400
-    tags = TagSerializer(many=True, required=False)
+    # read_only=True -----> IMPORTANT!!, tags are written by the views, not here
+    # Reads titles straight off `instance.tags.all()`, so a queryset with
+    # `prefetch_related("tags")` serializes without a query per item.
+    tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field="title")
 
     class Meta:
         model = TodoItem
-        fields = "__all__"
+        # updated_at only backs conditional requests, it is not part of the API
+        exclude = ["updated_at"]
         read_only_fields = ["timestamp"]
+        # serializer time shows up in Server-Timing and /api/metrics/
+        list_serializer_class = TimedListSerializer
+
+    def __init__(self, *args, **kwargs):
+        # `fields` limits the output to a subset of the fields (sparse fieldsets)
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+    @property
+    def data(self):
+        with timer("serialize"):
+            return super().data
+
+
+def format_datetime(value, tz):
+    # what serializers.DateTimeField renders with the default ISO 8601 format
+    value = value.astimezone(tz).isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def format_date(value):
+    return None if value is None else value.isoformat()
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation["tags"] = [
-            tag["title"] for tag in TagSerializer(instance.tags.all(), many=True).data
+
+class TodoItemValuesSerializer:
+    """
+    Read-only fast path for `TodoItemSerializer(..., many=True).data`, with
+    the same output, for large lists.
+
+    Serializes `.values(*TodoItemValuesSerializer.columns(fields))` rows into
+    plain dicts, and takes the tags of all rows from one query instead of a
+    prefetch. There are no model instances and no per-field DRF calls, so
+    changes to TodoItemSerializer have to be mirrored here.
+    """
+
+    # in TodoItemSerializer's field order
+    fields = [
+        "id",
+        "tags",
+        "title",
+        "timestamp",
+        "description",
+        "due_date",
+        "status",
+        "user",
+    ]
+
+    def __init__(self, rows, many=True, fields=None):
+        # `many` only keeps the TodoItemSerializer call signature
+        self.rows = rows
+        if fields is not None:
+            self.fields = [field for field in self.fields if field in fields]
+
+    @classmethod
+    def columns(cls, fields=None):
+        """Return the `.values()` columns to fetch for `fields`."""
+        columns = [
+            field for field in cls(None, fields=fields).fields if field != "tags"
         ]
-        return representation
+        if fields is not None and "tags" in fields and "id" not in fields:
+            # tags are looked up by id
+            columns.append("id")
+        return columns
+
+    def get_tags(self, rows):
+        tags = {row["id"]: [] for row in rows}
+        if tags:
+            # exactly the query of prefetch_related("tags"): titles come in
+            # the order of its query plan, which depends on the ids passed
+            links = Tag.objects.filter(todoitem__in=list(tags)).values_list(
+                "todoitem", "title"
+            )
+            for todo_id, title in links:
+                tags[todo_id].append(title)
+        return tags
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        tags = self.get_tags(rows) if "tags" in self.fields else None
+        with timer("serialize"):
+            if "timestamp" in self.fields:
+                # looked up once, it is a context variable
+                tz = timezone.get_current_timezone()
+                for row in rows:
+                    row["timestamp"] = format_datetime(row["timestamp"], tz)
+            if "due_date" in self.fields:
+                for row in rows:
+                    row["due_date"] = format_date(row["due_date"])
+            if tags is not None:
+                for row in rows:
+                    row["tags"] = tags[row["id"]]
+            fields = self.fields
+            return [{field: row[field] for field in fields} for row in rows]
+
+
+class TodoItemTagsSerializer(serializers.Serializer):
+    # the tag titles sent with a todo item, which the views write themselves
+    tags = serializers.ListField(
+        child=serializers.CharField(max_length=Tag._meta.get_field("title").max_length),
+        required=False,
+    )
+
+
+class TodoItemIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class BulkUpdateTodoItemSerializer(TodoItemIdsSerializer):
+    changes = serializers.DictField()
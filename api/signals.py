@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .authentication import evict_token
+from .cache import invalidate_user
+from .models import TodoItem
+from .stats import count_deleted_item, count_saved_item
+from .tags import forget_tag_usage
+
+
+@receiver(post_save, sender=TodoItem)
+@receiver(post_delete, sender=TodoItem)
+def invalidate_todo_owner(sender, instance, **kwargs):
+    if instance.user_id is not None:
+        invalidate_user(instance.user_id)
+
+
+@receiver(pre_save, sender=TodoItem)
+def remember_counted_status(sender, instance, **kwargs):
+    # the counters need the status being replaced; costs a query per update
+    if settings.TODO_STATS_COUNTERS and not instance._state.adding:
+        instance._counted_as = (
+            TodoItem.objects.filter(pk=instance.pk)
+            .values_list("user_id", "status")
+            .first()
+        )
+
+
+@receiver(post_save, sender=TodoItem)
+def update_status_counts(sender, instance, created, **kwargs):
+    count_saved_item(
+        instance, None if created else instance.__dict__.pop("_counted_as", None)
+    )
+
+
+@receiver(post_delete, sender=TodoItem)
+def decrement_status_count(sender, instance, **kwargs):
+    count_deleted_item(instance)
+
+
+@receiver(m2m_changed, sender=TodoItem.tags.through)
+def touch_tagged_todos(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Tag changes alter a todo's representation without saving it, so bump
+    `updated_at` of the affected todos and invalidate their owners' caches.
+    The changed tags' usage counts are dropped too, where they are known.
+    """
+    if reverse and action == "pre_clear":
+        # tag.todoitem_set.clear(): the affected todos are only known up front
+        todos = TodoItem.objects.filter(
+            pk__in=list(instance.todoitem_set.values_list("pk", flat=True))
+        )
+    elif action not in ("post_add", "post_remove", "post_clear"):
+        return
+    elif action != "post_clear" and not pk_set:
+        # add()/remove() of tags that were already there/absent
+        return
+    elif not reverse:
+        todos = TodoItem.objects.filter(pk=instance.pk)
+        # pk_set holds tag ids, and is None after todo.tags.clear()
+        forget_tag_usage(instance.user_id, pk_set or [])
+    elif pk_set:
+        # tag.todoitem_set.add/remove(...): pk_set holds todo ids
+        todos = TodoItem.objects.filter(pk__in=pk_set)
+    else:
+        return
+
+    todos.update(updated_at=timezone.now())
+    if reverse:
+        user_ids = todos.values_list("user_id", flat=True)
+    else:
+        user_ids = [instance.user_id]
+    for user_id in set(user_ids):
+        if user_id is not None:
+            if reverse:
+                forget_tag_usage(user_id, [instance.pk])
+            invalidate_user(user_id)
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    evict_token(instance.key)
+
+
+@receiver(post_save, sender=User)
+def evict_user_tokens(sender, instance, created, **kwargs):
+    # covers deactivation as well as any other change to the cached user
+    if created:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list("key", flat=True):
+        evict_token(key)
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+
+from .filters import STATUSES
+from .models import TodoItem, TodoStatusCount
+
+
+def counted_statuses(queryset):
+    # one GROUP BY, with every status present
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update(queryset.values_list("status").annotate(count=Count("id")))
+    return counts
+
+
+def status_counts(user):
+    """
+    Return `{status: count}` of `user`'s items, from the counter table while
+    `TODO_STATS_COUNTERS` is on.
+    """
+    if not settings.TODO_STATS_COUNTERS:
+        return counted_statuses(TodoItem.objects.filter(user=user).order_by())
+    counts = dict(
+        TodoStatusCount.objects.filter(user=user).values_list("status", "count")
+    )
+    if not counts:
+        counts = refresh_status_counts([user.pk])[user.pk]
+    return {status: counts.get(status, 0) for status in STATUSES}
+
+
+def tag_counts(user):
+    through = TodoItem.tags.through.objects.filter(todoitem__user=user)
+    return dict(
+        through.values_list("tag__title")
+        .annotate(count=Count("id"))
+        .order_by("-count", "tag__title")
+    )
+
+
+def due_counts(user, today):
+    """Count `user`'s unfinished items by how soon they are due."""
+    pending = TodoItem.objects.filter(user=user).exclude(status="DONE")
+    return pending.aggregate(
+        past=Count("id", filter=Q(due_date__lt=today)),
+        today=Count("id", filter=Q(due_date=today)),
+        next_7_days=Count(
+            "id",
+            filter=Q(due_date__gt=today, due_date__lte=today + timedelta(days=7)),
+        ),
+    )
+
+
+def todo_stats(user, today):
+    statuses = status_counts(user)
+    return {
+        "total": sum(statuses.values()),
+        "status": statuses,
+        "tags": tag_counts(user),
+        "due": due_counts(user, today),
+    }
+
+
+# ------------------------- counter maintenance -------------------------
+
+
+def refresh_status_counts(user_ids):
+    """
+    Recount the status counters of `user_ids` from their items, for writes
+    that bypass model signals (bulk_create, update, bulk_update). Returns the
+    new counts per user; does nothing while `TODO_STATS_COUNTERS` is off.
+    """
+    if not settings.TODO_STATS_COUNTERS:
+        return {}
+    counts = {user_id: dict.fromkeys(STATUSES, 0) for user_id in user_ids}
+    rows = (
+        TodoItem.objects.filter(user_id__in=counts)
+        .values_list("user_id", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for user_id, status, count in rows:
+        counts[user_id][status] = count
+    # an upsert, so concurrent recounts of one user cannot collide on
+    # todo_status_count_unique; every status is written, zeros included
+    TodoStatusCount.objects.bulk_create(
+        [
+            TodoStatusCount(user_id=user_id, status=status, count=count)
+            for user_id, user_counts in counts.items()
+            for status, count in user_counts.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "status"],
+        update_fields=["count"],
+    )
+    return counts
+
+
+def add_to_status_count(user_id, status, delta):
+    updated = TodoStatusCount.objects.filter(user_id=user_id, status=status).update(
+        count=F("count") + delta
+    )
+    # never counted yet: start from the items themselves, which already
+    # include this change. Decrements are skipped, the user may be deleted.
+    if not updated and delta > 0:
+        refresh_status_counts([user_id])
+
+
+def count_saved_item(instance, previous):
+    """
+    Move `instance` between counters after a save. `previous` is its
+    `(user_id, status)` before the save, or None when it was just created.
+    """
+    current = (instance.user_id, instance.status)
+    if not settings.TODO_STATS_COUNTERS or previous == current:
+        return
+    if previous is not None and previous[0] is not None:
+        add_to_status_count(*previous, -1)
+    if instance.user_id is not None:
+        add_to_status_count(*current, 1)
+
+
+def count_deleted_item(instance):
+    if settings.TODO_STATS_COUNTERS and instance.user_id is not None:
+        add_to_status_count(instance.user_id, instance.status, -1)
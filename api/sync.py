@@ -0,0 +1,66 @@
+"""
+Delta sync: the todo items a client has to fetch or drop since its last
+sync, see SyncTodoItemView.
+
+Changes are found by `updated_at` (todo_user_updated_at_idx) and deletions by
+the tombstones the delete views write (tombstone_user_deleted_idx). The
+cursor handed to clients is the newest change they have seen, or
+`TODO_SYNC_OVERLAP` seconds before the sync when that is later.
+
+A write stamps its rows before it commits, so a sync may read a newer change
+while an older one is still uncommitted. Each sync therefore looks
+`TODO_SYNC_OVERLAP` seconds behind its cursor, and clients can receive a
+change twice; they have to apply changes idempotently.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Value
+
+from .models import TodoItem, TodoTombstone
+
+
+def encode_cursor(moment):
+    payload = {"t": moment.isoformat()}
+    return urlsafe_b64encode(json.dumps(payload).encode("ascii")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    """Return the time in `encoded`, or None when it is not a valid cursor."""
+    try:
+        payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        moment = datetime.fromisoformat(payload["t"])
+    except (TypeError, ValueError, KeyError):
+        return None
+    return moment if moment.tzinfo is not None else None
+
+
+def record_deletions(user_id, todo_ids):
+    """Write tombstones for `todo_ids`; call in the deleting transaction."""
+    TodoTombstone.objects.bulk_create(
+        [TodoTombstone(user_id=user_id, todo_id=todo_id) for todo_id in todo_ids]
+    )
+
+
+def changes_since(user, since):
+    """
+    Return the changes of `user`'s items since `since` (None for all items)
+    as `(items, changes)`.
+
+    `changes` holds `(id, changed_at, deleted)` rows from one query over both
+    indexes, which is all an unchanged sync costs. `items` selects the rows
+    of the changed items, to be read only when there are changes.
+    """
+    items = TodoItem.objects.filter(user=user)
+    if since is None:
+        return items, items.values_list("id", "updated_at", Value(False))
+
+    after = since - timedelta(seconds=settings.TODO_SYNC_OVERLAP)
+    items = items.filter(updated_at__gt=after)
+    tombstones = TodoTombstone.objects.filter(user=user, deleted_at__gt=after)
+    changes = items.values_list("id", "updated_at", Value(False)).union(
+        tombstones.values_list("todo_id", "deleted_at", Value(True)), all=True
+    )
+    return items, changes
@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db.models import Count, Value
+from django.db.models.functions import Concat, Lower
+
+from .cache import get_cache
+from .models import Tag, TodoItem
+
+# sorts after every character, so [prefix, prefix + PREFIX_END) is a range
+PREFIX_END = "\U0010ffff"
+
+
+def user_tags(user):
+    """
+    Return the tags on `user`'s todo items; tag titles are shared between
+    users, but each user only gets to see their own.
+
+    The user's tag ids are collected once from their items (an IN subquery),
+    so the cost follows the user's items rather than everyone's.
+    """
+    through = TodoItem.tags.through.objects.filter(todoitem__user=user)
+    return Tag.objects.filter(pk__in=through.values("tag_id"))
+
+
+def tags_by_title(user, prefix=""):
+    """
+    Return `user`'s tags in case-insensitive title order, optionally only
+    those whose title starts with `prefix`.
+
+    The prefix is matched as a range over tag_lower_title_idx instead of with
+    LIKE, so a page costs an index seek and `LIMIT` rows however many tags
+    there are. The prefix is lowered by the database too, since SQLite's
+    lower() only folds ASCII letters.
+    """
+    queryset = user_tags(user).annotate(lower_title=Lower("title"))
+    if prefix:
+        lower_prefix = Lower(Value(prefix))
+        queryset = queryset.filter(
+            lower_title__gte=lower_prefix,
+            lower_title__lt=Concat(lower_prefix, Value(PREFIX_END)),
+        )
+    return queryset.order_by("lower_title", "title")
+
+
+def usage_key(user_id, tag_id):
+    return f"todo:tag-usage:{user_id}:{tag_id}"
+
+
+def tag_usage(user_id, tag_ids):
+    """
+    Return `{tag_id: count}` of `user_id`'s todo items carrying each tag.
+
+    Counting a popular tag reads one index entry per item carrying it, too
+    slow for every keystroke, so counts are cached per user and tag. Tagging
+    drops the affected counts, see forget_tag_usage(); deleted items only
+    leave them after `TODO_TAG_USAGE_TIMEOUT`.
+    """
+    cache = get_cache()
+    keys = {usage_key(user_id, tag_id): tag_id for tag_id in tag_ids}
+    usage = {keys[key]: count for key, count in cache.get_many(keys).items()}
+    missing = [tag_id for tag_id in tag_ids if tag_id not in usage]
+    if missing:
+        counted = dict.fromkeys(missing, 0)
+        through = TodoItem.tags.through.objects.filter(
+            tag_id__in=missing, todoitem__user_id=user_id
+        )
+        counted.update(
+            through.values_list("tag_id").annotate(count=Count("id")).order_by()
+        )
+        cache.set_many(
+            {usage_key(user_id, tag_id): count for tag_id, count in counted.items()},
+            timeout=settings.TODO_TAG_USAGE_TIMEOUT,
+        )
+        usage.update(counted)
+    return usage
+
+
+def forget_tag_usage(user_id, tag_ids):
+    get_cache().delete_many([usage_key(user_id, tag_id) for tag_id in tag_ids])
+
+
+def with_usage(user, tags):
+    # counted for one page of tags at a time rather than annotated on the
+    # ranged query, which would have to group every matching tag first
+    usage = tag_usage(user.pk, [tag.pk for tag in tags])
+    for tag in tags:
+        tag.usage = usage.get(tag.pk, 0)
+    return tags
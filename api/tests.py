@@ -1,13 +1,57 @@
+from asgiref.sync import sync_to_async
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
 from rest_framework import status
-from django.test import TestCase
-
-from .models import Tag, TodoItem, User
+from django.contrib.auth.hashers import get_hasher
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy
+
+from .models import Tag, TodoItem, TodoStatusCount, TodoTombstone, User
+from .renderers import FastJSONRenderer
+from .async_views import (
+    AsyncCreateTodoItemView,
+    AsyncDeleteTodoItemView,
+    AsyncDetailTodoItemView,
+    AsyncListTodoItemView,
+    AsyncUpdateTodoItemView,
+)
+from .authentication import local_tokens
+from .cache import cache_stats
+from .events import get_hub, publish
+from .metrics import HISTOGRAMS
+from .stats import refresh_status_counts
+from .sync import decode_cursor, encode_cursor
+from .throttling import LoginRateThrottle, RegisterRateThrottle
 from .utils import validate_due_date
-from .serializers import UserSerializer, UserRegisterSerializer, TodoItemSerializer
+from .serializers import (
+    UserSerializer,
+    UserRegisterSerializer,
+    TodoItemSerializer,
+    TodoItemValuesSerializer,
+)
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib.util import find_spec
+from unittest import skipUnless
+from io import StringIO
+import asyncio
+import gzip
+import json
+import threading
+import time
 
-from datetime import date, timedelta
+
+# tags values the todo views reject with a 400
+INVALID_TAGS = [None, "ab", [{"a": 1}], [["a"]], [None], ["x" * 51]]
 
 
 # ---------------------- UTILS TESTCASE ----------------------
@@ -22,6 +66,22 @@ class UtilsTest(TestCase):
         self.assertEqual(validate_due_date(self.invalid_due_date), self.valid_due_date)
 
 
+class SQLitePragmaTest(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_connections_are_tuned(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        # journal_mode stays "memory" for the in-memory test database
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("cache_size"), -64 * 1024)
+        self.assertEqual(self.pragma("temp_store"), 2)
+
+
 # ------------------------------------------------------------
 
 
@@ -104,6 +164,94 @@ class TodoItemSerializerTestCase(TestCase):
         self.assertEqual(serialized_data, expected_representation)
 
 
+class TodoItemValuesSerializerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="testpassword")
+        tags = [Tag.objects.create(title=title) for title in ["b", "a", "c"]]
+        TodoItem.objects.create(
+            title="Tagged", due_date="2024-01-22", user=self.user
+        ).tags.add(tags[2], tags[0], tags[1])
+        TodoItem.objects.create(title="Plain", description="No due date")
+        TodoItem.objects.create(title="Done", status="DONE", user=self.user)
+
+    def assertSameOutput(self, fields=None):
+        queryset = TodoItem.objects.order_by("id")
+        expected = TodoItemSerializer(
+            queryset.prefetch_related("tags"), many=True, fields=fields
+        ).data
+        rows = queryset.values(*TodoItemValuesSerializer.columns(fields))
+        data = TodoItemValuesSerializer(rows, many=True, fields=fields).data
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_same_output_as_todo_item_serializer(self):
+        self.assertSameOutput()
+        self.assertSameOutput(fields=["tags", "title"])
+        self.assertSameOutput(fields=["due_date", "id"])
+        self.assertSameOutput(fields=["timestamp"])
+
+    @override_settings(TIME_ZONE="America/New_York")
+    def test_same_output_in_other_time_zone(self):
+        self.assertSameOutput()
+
+    def test_queries(self):
+        rows = TodoItem.objects.values(*TodoItemValuesSerializer.columns())
+        with self.assertNumQueries(2):
+            TodoItemValuesSerializer(rows, many=True).data
+        rows = TodoItem.objects.values(*TodoItemValuesSerializer.columns(["title"]))
+        with self.assertNumQueries(1):
+            TodoItemValuesSerializer(rows, many=True, fields=["title"]).data
+
+
+class FastJSONRendererTest(TestCase):
+    def setUp(self):
+        todo_instance = TodoItem.objects.create(title="Tâche", due_date="2024-01-22")
+        self.data = {
+            "items": TodoItemSerializer([todo_instance], many=True).data,
+            "aware": datetime(2024, 1, 20, 16, 26, 41, 630134, tzinfo=dt_timezone.utc),
+            "offset": datetime(
+                2024, 1, 20, 16, 26, tzinfo=dt_timezone(timedelta(hours=-5))
+            ),
+            "naive": datetime(2024, 1, 20, 16, 26, 41),
+            "date": date(2024, 1, 22),
+            "decimal": Decimal("1.50"),
+            "lazy": gettext_lazy("Invalid page."),
+            "separators": "a\u2028b\u2029c",
+            "keys": {1: "int", None: "none", 2.5: "float"},
+            "set": {1},
+            "big": 2**70,
+        }
+
+    def assertSameAsDRF(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    @skipUnless(find_spec("orjson"), "needs orjson")
+    @override_settings(TODO_JSON_BACKEND="orjson")
+    def test_orjson_output(self):
+        for value in self.data.values():
+            self.assertSameAsDRF(value)
+        self.assertSameAsDRF(self.data)
+        self.assertSameAsDRF(self.data, "application/json; indent=4")
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    @override_settings(TODO_JSON_BACKEND="stdlib")
+    def test_stdlib_output(self):
+        self.assertSameAsDRF(self.data)
+        self.assertSameAsDRF(self.data, "application/json; indent=4")
+
+    def test_default_renderer(self):
+        user = User.objects.create_user(username="testuser", password="testpassword")
+        TodoItem.objects.create(title="Tâche", user=user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get("/api/todo/")
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
 # ------------------------------------------------------------
 
 
@@ -129,6 +277,43 @@ class CreateUserViewTest(TestCase):
         self.assertEqual(response.json(), expected_data)
 
 
+class LoginRegisterThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", password="password")
+        self.client = APIClient()
+
+    def tearDown(self):
+        # leave no empty buckets behind for other tests posting to these views
+        cache.clear()
+
+    def test_test_suite_uses_fast_hasher(self):
+        self.assertEqual(get_hasher().algorithm, "md5")
+
+    def test_login_throttled_after_burst(self):
+        url = "/api/login/"
+        request = {"username": "testuser", "password": "password"}
+        for _ in range(LoginRateThrottle().num_requests):
+            response = self.client.post(url, request, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn("token", response.json())
+
+        response = self.client.post(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+    def test_register_throttled_after_burst(self):
+        url = "/api/register/"
+        for i in range(RegisterRateThrottle().num_requests):
+            request = {"username": f"user{i}", "password": "password"}
+            response = self.client.post(url, request, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        request = {"username": "one-too-many", "password": "password"}
+        response = self.client.post(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
 class ListAllTodoItemsViewTest(TestCase):
     def setUp(self):
         self.user = User.objects.create(username="testuser", password="testpassword")
@@ -191,6 +376,33 @@ class ListAllTodoItemsViewTest(TestCase):
         self.assertEqual(response.json(), self.expected_data)
 
 
+class ExportTodoItemsViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="testuser", password="testpassword")
+        self.tag1 = Tag.objects.create(title="tag1")
+        self.tag2 = Tag.objects.create(title="tag2")
+        for i in range(5):
+            todo = TodoItem.objects.create(title=f"Test Item {i}", user=self.user)
+            todo.tags.add(self.tag1, self.tag2)
+
+        self.client = APIClient()
+
+    @override_settings(TODO_EXPORT_CHUNK_SIZE=2)
+    def test_export_todo_items_ndjson(self):
+        response = self.client.get("/api/todo/all/export/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertTrue(response.streaming)
+
+        # one query for the rows plus one tag query per chunk of two
+        with self.assertNumQueries(4):
+            body = b"".join(response.streaming_content)
+
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        expected = TodoItemSerializer(TodoItem.objects.order_by("id"), many=True).data
+        self.assertEqual(lines, expected)
+
+
 class ListUserViewTest(TestCase):
     def setUp(self):
         self.luffy = User.objects.create_user(username="luffy", password="password")
@@ -264,6 +476,87 @@ class CreateTodoItemViewTest(TestCase):
             response.json(), {"status": ['"SOMETHING" is not a valid choice.']}
         )
 
+    def test_create_todo_item_view_400_tags_invalid(self):
+        url = "/api/todo/create/"
+        for tags in INVALID_TAGS:
+            with self.subTest(tags=tags):
+                request = {"title": "Test Todo", "status": "OPEN", "tags": tags}
+                response = self.client.post(url, request, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(list(response.json()), ["tags"])
+        self.assertFalse(TodoItem.objects.exists())
+        self.assertFalse(Tag.objects.exists())
+
+
+class BulkCreateTodoItemViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", password="password")
+        Tag.objects.create(title="tag1")
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def build_request(self, count):
+        return [
+            {
+                "title": f"Test Todo {i}",
+                "description": "Test Todo Description",
+                "status": "OPEN",
+                "tags": ["tag1", f"tag{i + 2}"],
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_todo_item_view_201(self):
+        url = "/api/todo/bulk-create/"
+        response = self.client.post(url, self.build_request(3), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        todos = TodoItem.objects.filter(user=self.user).order_by("id")
+        self.assertEqual(todos.count(), 3)
+        self.assertEqual(response.json(), TodoItemSerializer(todos, many=True).data)
+        self.assertEqual(
+            sorted(Tag.objects.values_list("title", flat=True)),
+            ["tag1", "tag2", "tag3", "tag4"],
+        )
+
+    def test_bulk_create_todo_item_view_constant_queries(self):
+        url = "/api/todo/bulk-create/"
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(url, self.build_request(2), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(url, self.build_request(30), format="json")
+        self.assertEqual(len(small), len(large))
+
+    def test_bulk_create_todo_item_view_400_serializer_invalid(self):
+        request = self.build_request(2)
+        request[1]["status"] = "SOMETHING"
+        url = "/api/todo/bulk-create/"
+        response = self.client.post(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), [{}, {"status": ['"SOMETHING" is not a valid choice.']}]
+        )
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_bulk_create_todo_item_view_400_tags_invalid(self):
+        url = "/api/todo/bulk-create/"
+        for tags in INVALID_TAGS:
+            with self.subTest(tags=tags):
+                request = self.build_request(2)
+                request[1]["tags"] = tags
+                response = self.client.post(url, request, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(response.json()[0], {})
+                self.assertEqual(list(response.json()[1]), ["tags"])
+        self.assertFalse(TodoItem.objects.exists())
+        self.assertEqual(list(Tag.objects.values_list("title", flat=True)), ["tag1"])
+
+    def test_bulk_create_todo_item_view_400_not_a_list(self):
+        url = "/api/todo/bulk-create/"
+        response = self.client.post(url, {"title": "Test Todo"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class DetailTodoItemViewTest(TestCase):
     def setUp(self):
@@ -340,6 +633,958 @@ class ListTodoItemViewTest(TestCase):
         self.assertEqual(response.json(), serializer.data)
 
 
+class ListTodoItemFilterTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.tag1 = Tag.objects.create(title="tag1")
+        self.tag2 = Tag.objects.create(title="tag2")
+
+        self.todo1 = TodoItem.objects.create(
+            title="B Todo", due_date="2024-01-10", status="OPEN", user=self.user
+        )
+        self.todo1.tags.add(self.tag1)
+        self.todo2 = TodoItem.objects.create(
+            title="A Todo", due_date="2024-01-20", status="DONE", user=self.user
+        )
+        self.todo2.tags.add(self.tag1, self.tag2)
+        self.todo3 = TodoItem.objects.create(
+            title="C Todo", due_date="2024-01-30", status="WORKING", user=self.user
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get_ids(self, query):
+        response = self.client.get(f"/api/todo/?{query}", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.json()]
+
+    def test_filter_by_status(self):
+        self.assertEqual(self.get_ids("status=OPEN,WORKING"), [1, 3])
+
+    def test_filter_by_tag(self):
+        self.assertEqual(self.get_ids("tag=tag1"), [1, 2])
+        self.assertEqual(self.get_ids("tag=tag1&tag=tag2"), [2])
+
+    def test_filter_by_due_date_range(self):
+        self.assertEqual(self.get_ids("due_after=2024-01-15"), [2, 3])
+        self.assertEqual(
+            self.get_ids("due_after=2024-01-05&due_before=2024-01-20"), [1, 2]
+        )
+
+    def test_ordering(self):
+        self.assertEqual(self.get_ids("ordering=title"), [2, 1, 3])
+        self.assertEqual(self.get_ids("ordering=-due_date"), [3, 2, 1])
+
+    def test_sparse_fields(self):
+        url = "/api/todo/?fields=id,title"
+        # fingerprint aggregate and todo rows, no tag query
+        with self.assertNumQueries(2):
+            response = self.client.get(url, format="json")
+        self.assertEqual(
+            response.json(),
+            [
+                {"id": 1, "title": "B Todo"},
+                {"id": 2, "title": "A Todo"},
+                {"id": 3, "title": "C Todo"},
+            ],
+        )
+
+    def test_sparse_fields_with_pagination(self):
+        url = "/api/todo/?fields=title,tags&page_size=2"
+        response = self.client.get(url, format="json")
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {"tags": ["tag1"], "title": "B Todo"},
+                {"tags": ["tag1", "tag2"], "title": "A Todo"},
+            ],
+        )
+
+    def test_invalid_parameters_400(self):
+        for query in [
+            "status=SOMETHING",
+            "due_after=20-01-2024",
+            "ordering=password",
+            "fields=password",
+            "ordering=title&page_size=2",
+        ]:
+            response = self.client.get(f"/api/todo/?{query}", format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ListTodoItemQueryCountTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.tags = [Tag.objects.create(title=f"tag{i}") for i in range(3)]
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_todos(self, count):
+        for i in range(count):
+            todo = TodoItem.objects.create(
+                title=f"Test Todo {i}", status="OPEN", user=self.user
+            )
+            todo.tags.add(*self.tags)
+
+    def test_list_todo_view_constant_queries(self):
+        # fingerprint aggregate, todo rows and one tag query
+        self.create_todos(2)
+        with self.assertNumQueries(3):
+            small = self.client.get("/api/todo/", format="json")
+
+        self.create_todos(20)
+        with self.assertNumQueries(3):
+            large = self.client.get("/api/todo/", format="json")
+
+        self.assertEqual(len(small.json()), 2)
+        self.assertEqual(len(large.json()), 22)
+        self.assertEqual(large.json()[0]["tags"], ["tag0", "tag1", "tag2"])
+
+    def test_list_all_todo_view_constant_queries(self):
+        self.create_todos(20)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/todo/all/", format="json")
+        self.assertEqual(len(response.json()), 20)
+
+
+class TodoItemCursorPaginationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.todos = [
+            TodoItem.objects.create(title=f"Test Todo {i}", user=self.user)
+            for i in range(5)
+        ]
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_cursor_pagination_walks_forward_and_back(self):
+        response = self.client.get("/api/todo/?page_size=2", format="json")
+        page1 = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in page1["results"]], [1, 2])
+        self.assertIsNone(page1["previous"])
+
+        page2 = self.client.get(page1["next"], format="json").json()
+        self.assertEqual([item["id"] for item in page2["results"]], [3, 4])
+
+        page3 = self.client.get(page2["next"], format="json").json()
+        self.assertEqual([item["id"] for item in page3["results"]], [5])
+        self.assertIsNone(page3["next"])
+
+        back = self.client.get(page3["previous"], format="json").json()
+        self.assertEqual([item["id"] for item in back["results"]], [3, 4])
+
+    def test_cursor_pagination_constant_queries(self):
+        page1 = self.client.get("/api/todo/all/?page_size=2", format="json").json()
+        with self.assertNumQueries(2):
+            self.client.get(page1["next"], format="json")
+
+    def test_cursor_pagination_invalid_cursor(self):
+        response = self.client.get("/api/todo/?cursor=garbage", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TodoResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(username="other", password="password")
+        self.tag1 = Tag.objects.create(title="tag1")
+        self.todo = TodoItem.objects.create(title="Test Todo", user=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_and_detail_served_from_cache(self):
+        stats = cache_stats()
+        for url in ["/api/todo/", "/api/todo/1/"]:
+            first = self.client.get(url, format="json")
+            with self.assertNumQueries(0):
+                second = self.client.get(url, format="json")
+            self.assertEqual(first.json(), second.json())
+        self.assertEqual(cache_stats()["hits"], stats["hits"] + 2)
+        self.assertEqual(cache_stats()["misses"], stats["misses"] + 2)
+
+    def test_query_parameters_are_part_of_the_key(self):
+        self.client.get("/api/todo/", format="json")
+        response = self.client.get("/api/todo/?fields=title", format="json")
+        self.assertEqual(response.json(), [{"title": "Test Todo"}])
+
+    def test_writes_invalidate_cache(self):
+        self.client.get("/api/todo/", format="json")
+        self.client.patch("/api/todo/update/1/", {"tags": ["tag1"]}, format="json")
+        self.assertEqual(
+            self.client.get("/api/todo/", format="json").json()[0]["tags"], ["tag1"]
+        )
+
+        self.todo.tags.remove(self.tag1)
+        self.assertEqual(
+            self.client.get("/api/todo/", format="json").json()[0]["tags"], []
+        )
+
+        self.client.delete("/api/todo/delete/1/", format="json")
+        self.assertEqual(self.client.get("/api/todo/", format="json").json(), [])
+
+    def test_cache_is_per_user(self):
+        self.client.get("/api/todo/", format="json")
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(self.client.get("/api/todo/", format="json").json(), [])
+
+
+class ConditionalTodoResponseTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.todo = TodoItem.objects.create(title="Test Todo", user=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_if_none_match(self):
+        response = self.client.get("/api/todo/", format="json")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        not_modified = self.client.get("/api/todo/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], etag)
+
+        other_query = self.client.get("/api/todo/?status=OPEN", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other_query.status_code, status.HTTP_200_OK)
+
+        self.client.patch("/api/todo/update/1/", {"status": "DONE"}, format="json")
+        modified = self.client.get("/api/todo/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(modified["ETag"], etag)
+
+        self.client.delete("/api/todo/delete/1/", format="json")
+        deleted = self.client.get("/api/todo/", HTTP_IF_NONE_MATCH=modified["ETag"])
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+
+    def test_list_if_modified_since_after_delete(self):
+        TodoItem.objects.create(title="Other Todo", user=self.user)
+        response = self.client.get("/api/todo/", format="json")
+        self.assertFalse(response.has_header("Last-Modified"))
+
+        since = http_date(time.time() + 60)
+        self.client.delete("/api/todo/delete/1/", format="json")
+        modified = self.client.get("/api/todo/", HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in modified.json()], [2])
+
+    def test_detail_if_none_match(self):
+        etag = self.client.get("/api/todo/1/", format="json")["ETag"]
+        with self.assertNumQueries(0):
+            not_modified = self.client.get("/api/todo/1/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.todo.tags.add(Tag.objects.create(title="tag1"))
+        modified = self.client.get("/api/todo/1/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(modified.status_code, status.HTTP_200_OK)
+        self.assertEqual(modified.json()["tags"], ["tag1"])
+
+    def test_detail_404_has_no_etag(self):
+        response = self.client.get("/api/todo/2/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_token_lookup_is_cached(self):
+        self.client.get("/api/todo/", format="json")
+        # token, fingerprint and response all come from the cache
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/todo/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        local_tokens.clear()
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/todo/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_token_is_evicted(self):
+        self.client.get("/api/todo/", format="json")
+        self.token.delete()
+        response = self.client.get("/api/todo/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_evicted(self):
+        self.client.get("/api/todo/", format="json")
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/todo/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        response = self.client.get("/api/todo/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PerformanceMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        for histogram in HISTOGRAMS.values():
+            histogram.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        TodoItem.objects.create(title="Test Todo", status="OPEN", user=self.user)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_server_timing_header(self):
+        response = self.client.get("/api/todo/", format="json")
+        entries = dict(
+            entry.split(";", 1) for entry in response["Server-Timing"].split(", ")
+        )
+        self.assertEqual(set(entries), {"app", "db", "auth", "serialize"})
+        # token, fingerprint, rows and tags
+        self.assertIn('desc="4 queries"', entries["db"])
+
+        response = self.client.get("/api/todo/", format="json")
+        self.assertIn('desc="0 queries"', response["Server-Timing"])
+
+    @override_settings(TODO_SERVER_TIMING=False)
+    def test_server_timing_can_be_disabled(self):
+        response = self.client.get("/api/todo/", format="json")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_log_line(self):
+        with self.assertLogs("api.performance", "INFO") as logs:
+            self.client.get("/api/todo/", format="json")
+        fields = logs.records[0].performance
+        self.assertEqual(
+            (fields["route"], fields["status"], fields["db_queries"]),
+            ("api/todo/", 200, 4),
+        )
+        self.assertEqual(fields["bytes"], len(self.client.get("/api/todo/").content))
+
+    def test_metrics_endpoint(self):
+        self.client.get("/api/todo/", format="json")
+        self.client.get("/api/todo/", format="json")
+        self.client.get("/api/todo/12345/", format="json")
+
+        response = self.client.get("/api/metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        lines = response.content.decode().splitlines()
+        labels = 'method="GET",route="api/todo/",status="200"'
+        self.assertIn(
+            f'todo_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2', lines
+        )
+        self.assertIn(f"todo_request_duration_seconds_count{{{labels}}} 2", lines)
+        # the first request ran 4 queries, the cached one none
+        self.assertIn(f'todo_request_db_queries_bucket{{{labels},le="0"}} 1', lines)
+        self.assertIn(f"todo_request_db_queries_sum{{{labels}}} 4", lines)
+        labels = 'method="GET",route="api/todo/<int:pk>/",status="404"'
+        self.assertIn(f"todo_request_duration_seconds_count{{{labels}}} 1", lines)
+
+
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        for i in range(20):
+            TodoItem.objects.create(title=f"Test Todo {i}", user=self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, encoding):
+        return self.client.get(url, headers={"Accept-Encoding": encoding})
+
+    def test_gzip(self):
+        plain = self.get("/api/todo/", "identity")
+        response = self.get("/api/todo/", "gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertIn("compress;dur=", response["Server-Timing"])
+
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+    def test_gzip_refused(self):
+        for encoding in ["gzip;q=0", "br;q=0.5, deflate", "*"]:
+            response = self.get("/api/todo/", encoding)
+            self.assertFalse(response.has_header("Content-Encoding"), encoding)
+
+    @skipUnless(find_spec("brotli"), "needs brotli")
+    def test_brotli(self):
+        import brotli
+
+        plain = self.get("/api/todo/", "identity")
+        response = self.get("/api/todo/", "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+    def test_thresholds(self):
+        response = self.get("/api/todo/?fields=id&page_size=2", "gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertNotIn("Accept-Encoding", response["Vary"])
+
+        with override_settings(TODO_COMPRESSION_TYPES=["text/html"]):
+            response = self.get("/api/todo/", "gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+        with override_settings(TODO_COMPRESSION=False):
+            response = self.get("/api/todo/", "gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_html_is_not_compressed(self):
+        # pages with CSRF tokens, see BREACH
+        response = self.client.get("/admin/login/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(response["Content-Type"].startswith("text/html"))
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(TODO_EXPORT_CHUNK_SIZE=2)
+    def test_streaming_export(self):
+        plain = self.get("/api/todo/all/export/", "identity")
+        response = self.get("/api/todo/all/export/", "gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        chunks = list(response.streaming_content)
+        # one flushed chunk per export chunk, plus the gzip trailer
+        self.assertEqual(len(chunks), 11)
+        self.assertEqual(
+            gzip.decompress(b"".join(chunks)), b"".join(plain.streaming_content)
+        )
+
+    def test_conditional_responses(self):
+        response = self.get("/api/todo/", "gzip")
+        response = self.client.get(
+            "/api/todo/",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class SearchTodoItemViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        other = User.objects.create_user(username="other", password="testpassword")
+        self.milk = TodoItem.objects.create(
+            title="Buy milk", description="From the store", user=self.user
+        )
+        self.report = TodoItem.objects.create(
+            title="Write report", description="Include milk prices", user=self.user
+        )
+        TodoItem.objects.create(title="Buy milk", user=other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, query):
+        response = self.client.get(f"/api/todo/search/?{query}", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def result_ids(self, query):
+        return [item["id"] for item in self.search(query)["results"]]
+
+    def test_search_todo_view(self):
+        data = self.search("q=milk")
+        self.assertEqual(
+            data["results"],
+            TodoItemSerializer([self.milk, self.report], many=True).data,
+        )
+        self.assertEqual((data["next"], data["previous"]), (None, None))
+
+    def test_search_matching(self):
+        # every word, the last one as a prefix, stemmed, case and accent blind
+        self.assertEqual(self.result_ids("q=buy+store"), [self.milk.id])
+        self.assertEqual(self.result_ids("q=rep"), [self.report.id])
+        self.assertEqual(self.result_ids("q=buying"), [self.milk.id])
+        self.assertEqual(self.result_ids("q=MÍLK+pricés"), [self.report.id])
+        self.assertEqual(self.result_ids("q=milk+bread"), [])
+        # single letters only match whole words
+        self.assertEqual(self.result_ids("q=b"), [])
+
+    def test_search_ranking(self):
+        newer = TodoItem.objects.create(title="Milk run", user=self.user)
+        # title matches first, newest first
+        self.assertEqual(
+            self.result_ids("q=milk"), [newer.id, self.milk.id, self.report.id]
+        )
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(self.result_ids('q=milk"+OR+NOT+"report'), [])
+        self.assertEqual(self.result_ids("q=*+:+("), [])
+        # the user scope cannot be matched against
+        self.assertEqual(self.result_ids(f"q={self.user.pk}"), [])
+
+    def test_search_follows_writes(self):
+        self.client.patch(
+            f"/api/todo/update/{self.milk.id}/", {"title": "Buy bread"}, format="json"
+        )
+        self.assertEqual(self.result_ids("q=milk"), [self.report.id])
+        self.assertEqual(self.result_ids("q=bread"), [self.milk.id])
+
+        TodoItem.objects.filter(id=self.report.id).update(description="")
+        self.client.delete(f"/api/todo/delete/{self.milk.id}/", format="json")
+        self.assertEqual(self.result_ids("q=milk"), [])
+        self.assertEqual(self.result_ids("q=bread"), [])
+
+    def test_search_pagination(self):
+        data = self.search("q=milk&page_size=1")
+        self.assertEqual([item["id"] for item in data["results"]], [self.milk.id])
+        self.assertEqual(
+            data["next"], "http://testserver/api/todo/search/?page=2&page_size=1&q=milk"
+        )
+        self.assertIsNone(data["previous"])
+
+        data = self.search("q=milk&page_size=1&page=2")
+        self.assertEqual([item["id"] for item in data["results"]], [self.report.id])
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            data["previous"], "http://testserver/api/todo/search/?page_size=1&q=milk"
+        )
+
+    def test_search_todo_view_invalid(self):
+        response = self.client.get("/api/todo/search/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"q": ["This query parameter is required."]})
+
+        response = self.client.get("/api/todo/search/?q=milk&page=0", format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class MarkOverdueCommandTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        other = User.objects.create_user(username="other", password="testpassword")
+        yesterday = date.today() - timedelta(days=1)
+        self.overdue = [
+            TodoItem.objects.create(
+                title="Open", status="OPEN", due_date=yesterday, user=self.user
+            ),
+            TodoItem.objects.create(
+                title="Working", status="WORKING", due_date=yesterday, user=other
+            ),
+        ]
+        self.untouched = [
+            TodoItem.objects.create(
+                title="Done", status="DONE", due_date=yesterday, user=self.user
+            ),
+            TodoItem.objects.create(
+                title="Due today", status="OPEN", due_date=date.today(), user=self.user
+            ),
+            TodoItem.objects.create(title="No due date", status="OPEN", user=self.user),
+        ]
+
+    def mark_overdue(self, *args):
+        stdout = StringIO()
+        call_command("mark_overdue", *args, stdout=stdout)
+        return stdout.getvalue().strip()
+
+    def statuses(self, todo_instances):
+        return [
+            TodoItem.objects.get(id=todo_instance.id).status
+            for todo_instance in todo_instances
+        ]
+
+    def test_mark_overdue(self):
+        output = self.mark_overdue("--chunk-size", "1")
+        self.assertEqual(output, "Marked 2 items of 2 users overdue in 2 chunks.")
+        self.assertEqual(self.statuses(self.overdue), ["OVERDUE", "OVERDUE"])
+        self.assertEqual(self.statuses(self.untouched), ["DONE", "OPEN", "OPEN"])
+
+        # idempotent
+        output = self.mark_overdue()
+        self.assertEqual(output, "Marked 0 items of 0 users overdue in 0 chunks.")
+
+    def test_mark_overdue_date_and_dry_run(self):
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        output = self.mark_overdue("--date", tomorrow, "--dry-run")
+        self.assertEqual(output, f"3 items of 2 users are due before {tomorrow}.")
+        self.assertEqual(self.statuses(self.overdue), ["OPEN", "WORKING"])
+
+        output = self.mark_overdue("--date", tomorrow)
+        self.assertEqual(output, "Marked 3 items of 2 users overdue in 1 chunks.")
+        self.assertEqual(self.statuses(self.untouched), ["DONE", "OVERDUE", "OPEN"])
+
+        with self.assertRaises(CommandError):
+            self.mark_overdue("--date", "tomorrow")
+
+    def test_mark_overdue_invalidates_cached_responses(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get("/api/todo/?status=OVERDUE", format="json")
+        self.assertEqual(response.data, [])
+
+        self.mark_overdue()
+        response = client.get("/api/todo/?status=OVERDUE", format="json")
+        self.assertEqual([item["id"] for item in response.data], [self.overdue[0].id])
+
+
+class StatsTodoItemViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        other = User.objects.create_user(username="other", password="testpassword")
+        today = date.today()
+        work, home = Tag.objects.create(title="work"), Tag.objects.create(title="home")
+        self.items = [
+            TodoItem.objects.create(
+                title=title, status=item_status, due_date=due_date, user=self.user
+            )
+            for title, item_status, due_date in [
+                ("Late", "OPEN", today - timedelta(days=1)),
+                ("Now", "WORKING", today),
+                ("Soon", "OPEN", today + timedelta(days=7)),
+                ("Later", "OPEN", today + timedelta(days=8)),
+                ("Done", "DONE", today - timedelta(days=1)),
+            ]
+        ]
+        self.items[0].tags.add(work, home)
+        self.items[1].tags.add(work)
+        TodoItem.objects.create(title="Other", status="OPEN", user=other).tags.add(home)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def stats(self):
+        response = self.client.get("/api/todo/stats/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def grouped_status_counts(self):
+        counts = dict.fromkeys(["OPEN", "WORKING", "DONE", "OVERDUE"], 0)
+        for todo_instance in TodoItem.objects.filter(user=self.user):
+            counts[todo_instance.status] += 1
+        return counts
+
+    def test_stats_todo_view(self):
+        self.assertEqual(
+            self.stats(),
+            {
+                "total": 5,
+                "status": {"OPEN": 3, "WORKING": 1, "DONE": 1, "OVERDUE": 0},
+                "tags": {"work": 2, "home": 1},
+                "due": {"past": 1, "today": 1, "next_7_days": 1},
+            },
+        )
+
+    def test_stats_todo_view_queries(self):
+        # one query per group: statuses, tags and due dates
+        with self.assertNumQueries(3):
+            self.stats()
+        with self.assertNumQueries(0):
+            self.stats()
+
+        self.client.post(
+            "/api/todo/create/", {"title": "New", "status": "DONE"}, format="json"
+        )
+        self.assertEqual(self.stats()["status"]["DONE"], 2)
+
+    @override_settings(TODO_STATS_COUNTERS=True)
+    def test_stats_todo_view_counters(self):
+        self.assertEqual(self.stats()["status"], self.grouped_status_counts())
+        # the counters replace the status GROUP BY
+        cache.clear()
+        with self.assertNumQueries(3):
+            self.stats()
+
+        self.client.post(
+            "/api/todo/create/", {"title": "New", "status": "DONE"}, format="json"
+        )
+        self.client.patch(
+            f"/api/todo/update/{self.items[0].id}/", {"status": "DONE"}, format="json"
+        )
+        self.client.delete(f"/api/todo/delete/{self.items[1].id}/", format="json")
+        self.assertEqual(
+            self.stats()["status"], {"OPEN": 2, "WORKING": 0, "DONE": 3, "OVERDUE": 0}
+        )
+
+        self.client.post(
+            "/api/todo/bulk-create/", [{"title": "A"}, {"title": "B"}], format="json"
+        )
+        self.client.patch(
+            "/api/todo/bulk-update/",
+            {"ids": [self.items[2].id], "changes": {"status": "WORKING"}},
+            format="json",
+        )
+        call_command("mark_overdue", stdout=StringIO())
+        self.client.delete(
+            "/api/todo/bulk-delete/", {"ids": [self.items[4].id]}, format="json"
+        )
+        self.assertEqual(self.stats()["status"], self.grouped_status_counts())
+        self.assertEqual(self.stats()["total"], 6)
+
+    @override_settings(TODO_STATS_COUNTERS=True)
+    def test_refresh_status_counts_upserts(self):
+        refresh_status_counts([self.user.pk])
+        rows = TodoStatusCount.objects.filter(user=self.user)
+        ids = sorted(rows.values_list("id", flat=True))
+        TodoItem.objects.filter(pk=self.items[0].pk).update(status="DONE")
+
+        # a concurrent recount may have written the rows first
+        with CaptureQueriesContext(connection) as queries:
+            refresh_status_counts([self.user.pk])
+        self.assertFalse(
+            [query for query in queries if query["sql"].startswith("DELETE")]
+        )
+        self.assertEqual(sorted(rows.values_list("id", flat=True)), ids)
+        self.assertEqual(
+            dict(rows.values_list("status", "count")), self.grouped_status_counts()
+        )
+
+    def test_stats_todo_view_unauthenticated(self):
+        response = APIClient().get("/api/todo/stats/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TagViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.tags = {
+            title: Tag.objects.create(title=title)
+            for title in ["work", "Workshop", "home", "wow", "errand"]
+        }
+        for titles in [["work", "home"], ["work"], ["Workshop"]]:
+            todo_instance = TodoItem.objects.create(title="Task", user=self.user)
+            todo_instance.tags.add(*[self.tags[title] for title in titles])
+        # other users' tags and items are not visible
+        other = User.objects.create_user(username="other", password="testpassword")
+        todo_instance = TodoItem.objects.create(title="Task", user=other)
+        todo_instance.tags.add(self.tags["work"], self.tags["wow"])
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url):
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def titles(self, data):
+        return [(tag["title"], tag["usage"]) for tag in data]
+
+    def test_tag_autocomplete_view(self):
+        # case-insensitive prefix, in title order, with usage counts
+        data = self.get("/api/tags/autocomplete/?q=WOR")
+        self.assertEqual(self.titles(data), [("work", 2), ("Workshop", 1)])
+        self.assertEqual(data[0]["id"], self.tags["work"].id)
+        self.assertEqual(
+            self.titles(self.get("/api/tags/autocomplete/?q=w")),
+            [("work", 2), ("Workshop", 1)],
+        )
+        self.assertEqual(self.get("/api/tags/autocomplete/?q=x"), [])
+        self.assertEqual(self.get("/api/tags/autocomplete/?q=e"), [])
+
+        with override_settings(TODO_TAG_SUGGESTIONS=1):
+            data = self.get("/api/tags/autocomplete/?q=w")
+        self.assertEqual(self.titles(data), [("work", 2)])
+
+        response = self.client.get("/api/tags/autocomplete/", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tag_autocomplete_view_queries(self):
+        # the prefix range, then the usage of the tags found
+        with self.assertNumQueries(2):
+            self.get("/api/tags/autocomplete/?q=w")
+        # usage counts are cached
+        with self.assertNumQueries(1):
+            self.get("/api/tags/autocomplete/?q=wo")
+
+    def test_tag_usage_follows_tagging(self):
+        self.get("/api/tags/autocomplete/?q=w")
+        self.client.post(
+            "/api/todo/create/", {"title": "New", "tags": ["wow"]}, format="json"
+        )
+        todo_instance = TodoItem.objects.filter(tags=self.tags["work"]).first()
+        self.client.patch(
+            f"/api/todo/update/{todo_instance.id}/", {"tags": ["wow"]}, format="json"
+        )
+        self.client.post(
+            "/api/todo/bulk-create/", [{"title": "A", "tags": ["wow"]}], format="json"
+        )
+        self.assertEqual(
+            self.titles(self.get("/api/tags/autocomplete/?q=w")),
+            [("work", 1), ("Workshop", 1), ("wow", 3)],
+        )
+
+    def test_tag_view(self):
+        data = self.get("/api/tags/")
+        self.assertEqual(
+            self.titles(data["results"]),
+            [("home", 1), ("work", 2), ("Workshop", 1)],
+        )
+        self.assertEqual((data["next"], data["previous"]), (None, None))
+
+        data = self.get("/api/tags/?q=wo&page_size=1&page=2")
+        self.assertEqual(self.titles(data["results"]), [("Workshop", 1)])
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            data["previous"], "http://testserver/api/tags/?page_size=1&q=wo"
+        )
+
+    def test_tag_detail_view(self):
+        data = self.get(f"/api/tags/{self.tags['work'].id}/")
+        self.assertEqual(
+            data, {"id": self.tags["work"].id, "title": "work", "usage": 2}
+        )
+
+        for pk in [0, self.tags["wow"].id, self.tags["errand"].id]:
+            response = self.client.get(f"/api/tags/{pk}/", format="json")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tag_views_unauthenticated(self):
+        for url in ["/api/tags/", "/api/tags/autocomplete/?q=w", "/api/tags/1/"]:
+            response = APIClient().get(url, format="json")
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(TODO_SYNC_OVERLAP=0)
+class SyncTodoItemViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(username="other", password="testpassword")
+        self.items = [
+            TodoItem.objects.create(title=f"Test Todo {i}", user=self.user)
+            for i in range(3)
+        ]
+        TodoItem.objects.create(title="Other", user=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def sync(self, cursor=None):
+        url = (
+            "/api/todo/sync/" if cursor is None else f"/api/todo/sync/?cursor={cursor}"
+        )
+        response = self.client.get(url, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def changed_ids(self, data):
+        return [item["id"] for item in data["changed"]]
+
+    def test_sync_todo_view(self):
+        data = self.sync()
+        expected = TodoItemSerializer(self.items, many=True).data
+        self.assertEqual(data["changed"], expected)
+        self.assertEqual(data["deleted"], [])
+
+        # nothing changed: one query over both indexes, and a cursor at least
+        # as recent
+        with self.assertNumQueries(1):
+            unchanged = self.sync(data["cursor"])
+        self.assertEqual((unchanged["changed"], unchanged["deleted"]), ([], []))
+        self.assertGreaterEqual(
+            decode_cursor(unchanged["cursor"]), decode_cursor(data["cursor"])
+        )
+
+        self.client.patch(
+            f"/api/todo/update/{self.items[0].id}/", {"status": "DONE"}, format="json"
+        )
+        self.client.delete(f"/api/todo/delete/{self.items[1].id}/", format="json")
+        created = self.client.post("/api/todo/create/", {"title": "New"}, format="json")
+        TodoItem.objects.create(title="Other again", user=self.other)
+        data = self.sync(data["cursor"])
+        self.assertEqual(self.changed_ids(data), [self.items[0].id, created.data["id"]])
+        self.assertEqual(data["changed"][0]["status"], "DONE")
+        self.assertEqual(data["deleted"], [self.items[1].id])
+
+        self.client.delete(
+            "/api/todo/bulk-delete/",
+            {"ids": [self.items[0].id, self.items[2].id]},
+            format="json",
+        )
+        data = self.sync(data["cursor"])
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(data["deleted"], [self.items[0].id, self.items[2].id])
+
+    @override_settings(TODO_SYNC_OVERLAP=60)
+    def test_sync_without_changes_moves_cursor(self):
+        # a client polling with no changes never reaches the retention limit
+        old = timezone.now() - timedelta(days=29)
+        TodoItem.objects.update(updated_at=old - timedelta(days=1))
+        before = timezone.now()
+        data = self.sync(encode_cursor(old))
+        self.assertEqual((data["changed"], data["deleted"]), ([], []))
+        self.assertGreaterEqual(
+            decode_cursor(data["cursor"]), before - timedelta(seconds=60)
+        )
+
+    @override_settings(TODO_SYNC_OVERLAP=60)
+    def test_sync_overlap(self):
+        # changes within the overlap are sent again
+        data = self.sync(self.sync()["cursor"])
+        self.assertEqual(self.changed_ids(data), [item.id for item in self.items])
+
+    def test_sync_todo_view_invalid(self):
+        response = self.client.get("/api/todo/sync/?cursor=nonsense", format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"cursor": ["Invalid cursor."]})
+
+        old = encode_cursor(timezone.now() - timedelta(days=31))
+        response = self.client.get(f"/api/todo/sync/?cursor={old}", format="json")
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_tombstones(self):
+        self.client.delete(f"/api/todo/delete/{self.items[0].id}/", format="json")
+        self.client.delete(f"/api/todo/delete/{self.items[1].id}/", format="json")
+        TodoTombstone.objects.filter(todo_id=self.items[0].id).update(
+            deleted_at=timezone.now() - timedelta(days=31)
+        )
+        stdout = StringIO()
+        call_command("prune_tombstones", stdout=stdout)
+        self.assertEqual(stdout.getvalue().strip(), "Pruned 1 tombstones.")
+        self.assertEqual(
+            list(TodoTombstone.objects.values_list("todo_id", flat=True)),
+            [self.items[1].id],
+        )
+
+
 class UpdateTodoItemViewTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -419,6 +1664,69 @@ class UpdateTodoItemViewTest(TestCase):
         )
 
 
+class PartialUpdateTodoItemViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+
+        self.tag1 = Tag.objects.create(title="tag1")
+        self.tag2 = Tag.objects.create(title="tag2")
+
+        self.todo = TodoItem.objects.create(
+            title="Test Todo",
+            description="Test Todo Description",
+            status="WORKING",
+            user=self.user,
+        )
+        self.todo.tags.add(self.tag1, self.tag2)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_patch_without_tags_keeps_tags(self):
+        url = "/api/todo/update/1/"
+        response = self.client.patch(url, {"status": "DONE"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "DONE")
+        self.assertEqual(response.json()["title"], "Test Todo")
+        self.assertEqual(sorted(response.json()["tags"]), ["tag1", "tag2"])
+
+    def test_patch_tags_only_touches_changed_rows(self):
+        through = TodoItem.tags.through
+        kept_link = through.objects.get(todoitem=self.todo, tag=self.tag1)
+
+        url = "/api/todo/update/1/"
+        response = self.client.patch(url, {"tags": ["tag1", "tag3"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.json()["tags"]), ["tag1", "tag3"])
+        self.assertTrue(through.objects.filter(pk=kept_link.pk).exists())
+
+    def test_put_unchanged_tags_writes_nothing(self):
+        through = TodoItem.tags.through
+        links = list(through.objects.order_by("pk").values_list("pk", flat=True))
+
+        url = "/api/todo/update/1/"
+        request = {"title": "Test Todo", "tags": ["tag2", "tag1"]}
+        response = self.client.put(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(through.objects.order_by("pk").values_list("pk", flat=True)), links
+        )
+
+    def test_patch_400_tags_invalid(self):
+        url = "/api/todo/update/1/"
+        for tags in INVALID_TAGS:
+            with self.subTest(tags=tags):
+                response = self.client.patch(url, {"tags": tags}, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(list(response.json()), ["tags"])
+        self.assertEqual(
+            sorted(self.todo.tags.values_list("title", flat=True)), ["tag1", "tag2"]
+        )
+        self.assertEqual(Tag.objects.count(), 2)
+
+
 class DeleteTodoItemViewTest(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -455,4 +1763,396 @@ class DeleteTodoItemViewTest(TestCase):
         )
 
 
+class BulkUpdateTodoItemViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(username="other", password="password")
+
+        self.todo1 = TodoItem.objects.create(title="Test Todo 1", user=self.user)
+        self.todo2 = TodoItem.objects.create(title="Test Todo 2", user=self.user)
+        self.other_todo = TodoItem.objects.create(title="Other Todo", user=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_update_same_changes(self):
+        url = "/api/todo/bulk-update/"
+        request = {"ids": [1, 2, 3, 9], "changes": {"status": "DONE"}}
+        with self.assertNumQueries(4):
+            response = self.client.patch(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"id": 1, "result": "updated"},
+                    {"id": 2, "result": "updated"},
+                    {"id": 3, "result": "not found"},
+                    {"id": 9, "result": "not found"},
+                ]
+            },
+        )
+        self.assertEqual(
+            list(TodoItem.objects.order_by("id").values_list("status", flat=True)),
+            ["DONE", "DONE", "OPEN"],
+        )
+
+    def test_bulk_update_per_item_changes(self):
+        url = "/api/todo/bulk-update/"
+        request = [
+            {"id": 1, "status": "WORKING"},
+            {"id": 2, "title": "Renamed Todo"},
+            {"id": 3, "title": "Not Mine"},
+        ]
+        response = self.client.patch(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["result"] for result in response.json()["results"]],
+            ["updated", "updated", "not found"],
+        )
+        self.todo1.refresh_from_db()
+        self.todo2.refresh_from_db()
+        self.other_todo.refresh_from_db()
+        self.assertEqual(self.todo1.status, "WORKING")
+        self.assertEqual(self.todo2.title, "Renamed Todo")
+        self.assertEqual(self.other_todo.title, "Other Todo")
+
+    def test_bulk_update_skips_items_without_changes(self):
+        before = TodoItem.objects.get(pk=2).updated_at
+        url = "/api/todo/bulk-update/"
+        request = [{"id": 1, "title": "Renamed Todo"}, {"id": 2}]
+        response = self.client.patch(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": 1, "result": "updated"}, {"id": 2, "result": "unchanged"}],
+        )
+        self.assertEqual(TodoItem.objects.get(pk=2).updated_at, before)
+
+        request = {"ids": [1, 9], "changes": {"id": 5}}
+        response = self.client.patch(url, request, format="json")
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": 1, "result": "unchanged"}, {"id": 9, "result": "not found"}],
+        )
+
+    def test_bulk_update_400_invalid_changes(self):
+        url = "/api/todo/bulk-update/"
+        request = {"ids": [1, 2], "changes": {"status": "SOMETHING"}}
+        response = self.client.patch(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(), {"status": ['"SOMETHING" is not a valid choice.']}
+        )
+
+    def test_bulk_update_400_tags(self):
+        url = "/api/todo/bulk-update/"
+        request = {"ids": [1], "changes": {"tags": ["tag1"]}}
+        response = self.client.patch(url, request, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkDeleteTodoItemViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.other = User.objects.create_user(username="other", password="password")
+        self.tag1 = Tag.objects.create(title="tag1")
+
+        for i in range(3):
+            todo = TodoItem.objects.create(title=f"Test Todo {i}", user=self.user)
+            todo.tags.add(self.tag1)
+        TodoItem.objects.create(title="Other Todo", user=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_bulk_delete_todo_items(self):
+        url = "/api/todo/bulk-delete/"
+        response = self.client.delete(url, {"ids": [1, 2, 4]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [
+                    {"id": 1, "result": "deleted"},
+                    {"id": 2, "result": "deleted"},
+                    {"id": 4, "result": "not found"},
+                ]
+            },
+        )
+        self.assertEqual(
+            list(TodoItem.objects.order_by("id").values_list("id", flat=True)), [3, 4]
+        )
+
+    def test_bulk_delete_400_missing_ids(self):
+        url = "/api/todo/bulk-delete/"
+        response = self.client.delete(url, {"ids": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AsyncTodoItemViewsTest(TestCase):
+    def setUp(self):
+        local_tokens.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.tag1 = Tag.objects.create(title="tag1")
+        self.todo = TodoItem.objects.create(
+            title="Test Todo", due_date="2024-01-23", status="OPEN", user=self.user
+        )
+        self.todo.tags.add(self.tag1)
+
+        self.factory = AsyncRequestFactory()
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    async def call(self, view, method, url, data=None, **kwargs):
+        request = getattr(self.factory, method)(
+            url, data=data, content_type="application/json", headers=self.headers
+        )
+        response = await view.as_view()(request, **kwargs)
+        return response.status_code, json.loads(response.content)
+
+    async def test_async_list_todo_view(self):
+        status_code, data = await self.call(
+            AsyncListTodoItemView, "get", "/api/todo/?fields=id,title,tags"
+        )
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data, [{"id": 1, "title": "Test Todo", "tags": ["tag1"]}])
+
+        status_code, data = await self.call(
+            AsyncListTodoItemView, "get", "/api/todo/?page_size=1"
+        )
+        self.assertEqual([item["id"] for item in data["results"]], [1])
+        self.assertIsNone(data["next"])
+
+    async def test_async_detail_todo_view(self):
+        status_code, data = await self.call(
+            AsyncDetailTodoItemView, "get", "/api/todo/1/", pk=1
+        )
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        expected = await sync_to_async(
+            lambda: TodoItemSerializer(TodoItem.objects.get(id=1)).data
+        )()
+        self.assertEqual(data, expected)
+
+        status_code, data = await self.call(
+            AsyncDetailTodoItemView, "get", "/api/todo/2/", pk=2
+        )
+        self.assertEqual(status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(data, {"error": "TodoItem matching query does not exist."})
+
+    async def test_async_create_update_delete(self):
+        request = {"title": "New Todo", "status": "OPEN", "tags": ["tag1", "tag2"]}
+        status_code, data = await self.call(
+            AsyncCreateTodoItemView, "post", "/api/todo/create/", request
+        )
+        self.assertEqual(status_code, status.HTTP_201_CREATED)
+        self.assertEqual(data["user"], self.user.id)
+        self.assertEqual(sorted(data["tags"]), ["tag1", "tag2"])
+
+        status_code, data = await self.call(
+            AsyncUpdateTodoItemView,
+            "patch",
+            "/api/todo/update/1/",
+            {"status": "DONE"},
+            pk=1,
+        )
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual((data["status"], data["tags"]), ("DONE", ["tag1"]))
+
+        status_code, data = await self.call(
+            AsyncUpdateTodoItemView,
+            "put",
+            "/api/todo/update/1/",
+            {"title": "Test Todo", "status": "SOMETHING"},
+            pk=1,
+        )
+        self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(data, {"status": ['"SOMETHING" is not a valid choice.']})
+
+        status_code, data = await self.call(
+            AsyncDeleteTodoItemView, "delete", "/api/todo/delete/1/", pk=1
+        )
+        self.assertEqual(status_code, status.HTTP_200_OK)
+        self.assertEqual(data, {"message": "Item 1 deleted successfully!"})
+        self.assertFalse(await TodoItem.objects.filter(id=1).aexists())
+        self.assertTrue(await TodoTombstone.objects.filter(todo_id=1).aexists())
+
+    async def test_async_create_400_tags_invalid(self):
+        for tags in INVALID_TAGS:
+            with self.subTest(tags=tags):
+                request = {"title": "New Todo", "status": "OPEN", "tags": tags}
+                status_code, data = await self.call(
+                    AsyncCreateTodoItemView, "post", "/api/todo/create/", request
+                )
+                self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(list(data), ["tags"])
+        self.assertEqual(await TodoItem.objects.acount(), 1)
+        self.assertEqual(await Tag.objects.acount(), 1)
+
+    async def test_async_update_400_tags_invalid(self):
+        for tags in INVALID_TAGS:
+            with self.subTest(tags=tags):
+                status_code, data = await self.call(
+                    AsyncUpdateTodoItemView,
+                    "patch",
+                    "/api/todo/update/1/",
+                    {"tags": tags},
+                    pk=1,
+                )
+                self.assertEqual(status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertEqual(list(data), ["tags"])
+        titles = TodoItem.tags.through.objects.values_list("tag__title", flat=True)
+        self.assertEqual([title async for title in titles], ["tag1"])
+
+    async def test_async_conditional_and_cached_responses(self):
+        await sync_to_async(cache.clear)()
+        for view, url, kwargs in [
+            (AsyncListTodoItemView, "/api/todo/", {}),
+            (AsyncDetailTodoItemView, "/api/todo/1/", {"pk": 1}),
+        ]:
+            with self.subTest(url=url):
+                request = self.factory.get(url, headers=self.headers)
+                response = await view.as_view()(request, **kwargs)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                etag = response["ETag"]
+
+                request = self.factory.get(
+                    url, headers={**self.headers, "If-None-Match": etag}
+                )
+                not_modified = await view.as_view()(request, **kwargs)
+                self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(not_modified["ETag"], etag)
+
+                hits = cache_stats()["hits"]
+                request = self.factory.get(url, headers=self.headers)
+                cached = await view.as_view()(request, **kwargs)
+                self.assertEqual(cached.content, response.content)
+                self.assertEqual(cache_stats()["hits"], hits + 1)
+
+    async def test_async_views_require_token(self):
+        self.headers = {}
+        status_code, data = await self.call(AsyncListTodoItemView, "get", "/api/todo/")
+        self.assertEqual(status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            data, {"detail": "Authentication credentials were not provided."}
+        )
+
+
+class AsyncEventsViewTest(TestCase):
+    def setUp(self):
+        local_tokens.clear()
+        self.user = User.objects.create_user(
+            username="testuser", password="testpassword"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.todo = TodoItem.objects.create(
+            title="Test Todo", status="OPEN", user=self.user
+        )
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    async def connect(self):
+        response = await self.async_client.get(
+            "/api/todo/events/", headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        stream = response.streaming_content
+        self.assertEqual(await self.receive(stream), b"retry: 3000\n\n")
+        return stream
+
+    async def receive(self, stream):
+        return await asyncio.wait_for(anext(stream), 1)
+
+    def patch(self, pk, data):
+        return self.client.patch(
+            f"/api/todo/update/{pk}/",
+            data,
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+    async def test_write_views_publish_events(self):
+        stream = await self.connect()
+        response = await sync_to_async(self.patch)(self.todo.pk, {"status": "DONE"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            await self.receive(stream),
+            f'event: updated\ndata: {{"id":{self.todo.pk}}}\n\n'.encode(),
+        )
+
+        response = await sync_to_async(self.client.delete)(
+            "/api/todo/bulk-delete/",
+            {"ids": [self.todo.pk, 999]},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            await self.receive(stream),
+            f'event: deleted\ndata: {{"id":{self.todo.pk}}}\n\n'.encode(),
+        )
+
+    async def test_bulk_update_without_changes_publishes_nothing(self):
+        stream = await self.connect()
+        for request in [{"ids": [self.todo.pk], "changes": {}}, [{"id": self.todo.pk}]]:
+            response = await sync_to_async(self.client.patch)(
+                "/api/todo/bulk-update/",
+                request,
+                content_type="application/json",
+                headers=self.headers,
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # events arrive in order, so nothing came before this one
+        publish(self.user.pk, "created", [0])
+        self.assertEqual(
+            await self.receive(stream), b'event: created\ndata: {"id":0}\n\n'
+        )
+
+    async def test_events_are_published_from_other_threads(self):
+        other = await User.objects.acreate(username="other")
+        stream = await self.connect()
+        thread = threading.Thread(
+            target=lambda: [
+                publish(other.pk, "created", [1]),
+                publish(self.user.pk, "created", [2]),
+            ]
+        )
+        thread.start()
+        thread.join()
+        self.assertEqual(
+            await self.receive(stream), b'event: created\ndata: {"id":2}\n\n'
+        )
+
+    async def test_idle_stream_sends_heartbeats_and_ends(self):
+        with self.settings(TODO_EVENTS_HEARTBEAT=0.01, TODO_EVENTS_MAX_AGE=0.1):
+            stream = await self.connect()
+            self.assertEqual(await self.receive(stream), b": heartbeat\n\n")
+            chunks = [chunk async for chunk in stream]
+        self.assertTrue(chunks)
+        self.assertEqual(set(chunks), {b": heartbeat\n\n"})
+        self.assertNotIn(self.user.pk, get_hub().subscriptions)
+
+    async def test_slow_stream_is_reset(self):
+        with self.settings(TODO_EVENTS_QUEUE_SIZE=2):
+            stream = await self.connect()
+            publish(self.user.pk, "updated", [1, 2, 3])
+            await asyncio.sleep(0)
+            chunks = [chunk async for chunk in stream]
+        self.assertEqual(chunks, [b"event: reset\ndata: {}\n\n"])
+
+    def test_events_need_asgi_and_a_token(self):
+        response = self.client.get("/api/todo/events/", headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+        response = self.client.get("/api/todo/events/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
 # -------------------------------------------------------------
@@ -0,0 +1,46 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket per client IP: a rate of "10/min" allows bursts of up to 10
+    requests and refills one token every 6 seconds.
+
+    Unlike DRF's sliding-window throttles only `(tokens, timestamp)` is kept
+    per client, so the cached state stays constant in size.
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        self.now = self.timer()
+        tokens, last = self.cache.get(self.key, (self.num_requests, self.now))
+        refill = (self.now - last) * self.num_requests / self.duration
+        self.tokens = min(self.num_requests, tokens + refill)
+        if self.tokens < 1:
+            return self.throttle_failure()
+
+        self.cache.set(self.key, (self.tokens - 1, self.now), self.duration)
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return (1 - self.tokens) * self.duration / self.num_requests
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    scope = "login"
+
+
+class RegisterRateThrottle(TokenBucketThrottle):
+    scope = "register"
@@ -1,28 +1,68 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework.authtoken.views import obtain_auth_token
+from .async_views import AsyncEventsView
 from .views import (
-    CreateTodoItemView,
+    BulkCreateTodoItemView,
+    BulkDeleteTodoItemView,
+    BulkUpdateTodoItemView,
+    CacheStatsView,
     CreateUserView,
+    ExportTodoItemsView,
     ListAllTodoItemsView,
-    ListTodoItemView,
     ListUserView,
-    UpdateTodoItemView,
-    DeleteTodoItemView,
-    DetailTodoItemView,
+    LoginView,
+    MetricsView,
+    SearchTodoItemView,
+    StatsTodoItemView,
+    SyncTodoItemView,
+    TagAutocompleteView,
+    TagDetailView,
+    TagView,
 )
 
+# TODO_ASYNC_VIEWS swaps the deliverables for their ASGI-native versions
+if settings.TODO_ASYNC_VIEWS:
+    from .async_views import (
+        AsyncCreateTodoItemView as CreateTodoItemView,
+        AsyncListTodoItemView as ListTodoItemView,
+        AsyncUpdateTodoItemView as UpdateTodoItemView,
+        AsyncDeleteTodoItemView as DeleteTodoItemView,
+        AsyncDetailTodoItemView as DetailTodoItemView,
+    )
+else:
+    from .views import (
+        CreateTodoItemView,
+        ListTodoItemView,
+        UpdateTodoItemView,
+        DeleteTodoItemView,
+        DetailTodoItemView,
+    )
+
 urlpatterns = [
     # ----------------API UTILITY---------------
-    path("login/", obtain_auth_token, name="login"),
+    path("login/", LoginView.as_view(), name="login"),
     path("register/", CreateUserView.as_view(), name="register"),
     path("todo/all/", ListAllTodoItemsView.as_view(), name="read-all-todos"),
+    path("todo/all/export/", ExportTodoItemsView.as_view(), name="export-all-todos"),
     path("users/", ListUserView.as_view(), name="users"),
+    path("cache/stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     # ----------------API UTILITY---------------
     # -------------API DELIVERABLES-------------
     path("todo/create/", CreateTodoItemView.as_view(), name="create"),
+    path("todo/bulk-create/", BulkCreateTodoItemView.as_view(), name="bulk-create"),
+    path("todo/bulk-update/", BulkUpdateTodoItemView.as_view(), name="bulk-update"),
+    path("todo/bulk-delete/", BulkDeleteTodoItemView.as_view(), name="bulk-delete"),
+    path("todo/search/", SearchTodoItemView.as_view(), name="search"),
+    path("todo/stats/", StatsTodoItemView.as_view(), name="stats"),
+    path("todo/sync/", SyncTodoItemView.as_view(), name="sync"),
+    path("todo/events/", AsyncEventsView.as_view(), name="events"),
     path("todo/<int:pk>/", DetailTodoItemView.as_view(), name="read"),
     path("todo/", ListTodoItemView.as_view(), name="read-all"),
     path("todo/update/<int:pk>/", UpdateTodoItemView.as_view(), name="update"),
     path("todo/delete/<int:pk>/", DeleteTodoItemView.as_view(), name="delete"),
+    path("tags/", TagView.as_view(), name="tags"),
+    path("tags/autocomplete/", TagAutocompleteView.as_view(), name="tag-autocomplete"),
+    path("tags/<int:pk>/", TagDetailView.as_view(), name="tag"),
     # -------------API DELIVERABLES-------------
 ]
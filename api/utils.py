@@ -1,5 +1,10 @@
 from datetime import datetime, date
-from .models import Tag
+from itertools import chain, islice
+
+from django.db.models import prefetch_related_objects
+from .models import Tag, TodoItem
+from .renderers import FastJSONRenderer
+from .tags import forget_tag_usage
 
 
 def validate_due_date(due_date):
@@ -11,9 +16,99 @@ def validate_due_date(due_date):
         return due_date
 
 
+def get_or_create_tags(titles):
+    """
+    Return a `{title: Tag}` map for `titles`, creating any missing tags.
+
+    Existing tags are resolved in one query and missing ones are inserted with
+    a single `bulk_create`; conflicts from concurrent inserts are ignored and
+    the winners are read back.
+    """
+    titles = set(titles)
+    if not titles:
+        return {}
+    tags = {tag.title: tag for tag in Tag.objects.filter(title__in=titles)}
+    missing = titles - tags.keys()
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(title=title) for title in missing], ignore_conflicts=True
+        )
+        tags.update({tag.title: tag for tag in Tag.objects.filter(title__in=missing)})
+    return tags
+
+
 def get_instance_with_tags(todo_instance, tags):
     new_todo_instance = todo_instance
-    for tag in tags:
-        tag, _ = Tag.objects.get_or_create(title=tag)
-        new_todo_instance.tags.add(tag)
+    titles = list(dict.fromkeys(tags))
+    tag_map = get_or_create_tags(titles)
+    new_todo_instance.tags.add(*[tag_map[title] for title in titles])
     return new_todo_instance
+
+
+def set_tags(todo_instance, tags):
+    """
+    Make the tags of `todo_instance` exactly `tags`, touching only the rows
+    that change: one `DELETE` for removed tags and one `INSERT` for added ones.
+
+    The through rows are written directly, so no `m2m_changed` is sent and
+    `updated_at` is left alone; save the instance in the same transaction.
+    """
+    titles = list(dict.fromkeys(tags))
+    through = TodoItem.tags.through
+    links = through.objects.filter(todoitem_id=todo_instance.pk)
+    current = dict(links.values_list("tag__title", "tag_id"))
+
+    removed = [tag_id for title, tag_id in current.items() if title not in titles]
+    if removed:
+        links.filter(tag_id__in=removed).delete()
+
+    added = [title for title in titles if title not in current]
+    if added:
+        tag_map = get_or_create_tags(added)
+        through.objects.bulk_create(
+            [through(todoitem_id=todo_instance.pk, tag_id=tag_map[t].pk) for t in added]
+        )
+        removed += [tag.pk for tag in tag_map.values()]
+    forget_tag_usage(todo_instance.user_id, removed)
+    return todo_instance
+
+
+def bulk_create_with_tags(todo_instances, tags_per_item):
+    """
+    Insert `todo_instances` and their tags in a constant number of queries.
+
+    `tags_per_item` holds the tag titles for each instance, in the same order.
+    Call this inside a transaction so a failure leaves no partial import.
+    """
+    todos = TodoItem.objects.bulk_create(todo_instances)
+    tag_map = get_or_create_tags(chain.from_iterable(tags_per_item))
+    through = TodoItem.tags.through
+    through.objects.bulk_create(
+        [
+            through(todoitem_id=todo.pk, tag_id=tag_map[title].pk)
+            for todo, titles in zip(todos, tags_per_item)
+            for title in dict.fromkeys(titles)
+        ]
+    )
+    for user_id in {todo.user_id for todo in todos}:
+        forget_tag_usage(user_id, [tag.pk for tag in tag_map.values()])
+    prefetch_related_objects(todos, "tags")
+    return todos
+
+
+def iter_ndjson(queryset, serializer_class, chunk_size):
+    """
+    Yield `queryset` as newline-delimited JSON, one chunk of rows at a time.
+
+    Rows come from a server-side `.iterator()`, so any `prefetch_related`
+    lookups on `queryset` are batch-loaded per chunk and memory stays bounded
+    by `chunk_size` rather than by the size of the table.
+    """
+    renderer = FastJSONRenderer()
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        data = serializer_class(chunk, many=True).data
+        yield b"".join(renderer.render(item) + b"\n" for item in data)
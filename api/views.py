@@ -1,17 +1,58 @@
-from rest_framework import permissions, authentication
+from datetime import timedelta
+
+from rest_framework import permissions
+from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 
-from .serializers import TodoItemSerializer, UserRegisterSerializer, UserSerializer
+from .authentication import CachedTokenAuthentication
+from .cache import cache_stats, cached_response, invalidate_user
+from .events import publish
+from .conditional import conditional_response, detail_fingerprint, list_fingerprint
+from .serializers import (
+    BulkUpdateTodoItemSerializer,
+    TagUsageSerializer,
+    TodoItemIdsSerializer,
+    TodoItemSerializer,
+    TodoItemTagsSerializer,
+    TodoItemValuesSerializer,
+    UserRegisterSerializer,
+    UserSerializer,
+)
+from .filters import filter_todo_items, get_ordering, get_sparse_fields, select_fields
+from .metrics import expose_metrics
 from .models import TodoItem, User
-from .utils import validate_due_date, get_instance_with_tags
+from .pagination import SearchPagination, TimestampCursorPagination
+from .search import search_todo_ids
+from .stats import refresh_status_counts, todo_stats
+from .sync import changes_since, decode_cursor, encode_cursor, record_deletions
+from .tags import tags_by_title, user_tags, with_usage
+from .throttling import LoginRateThrottle, RegisterRateThrottle
+from .utils import (
+    validate_due_date,
+    get_instance_with_tags,
+    iter_ndjson,
+    bulk_create_with_tags,
+    set_tags,
+)
 
 
 # ----------------API UTILITY---------------
+class LoginView(ObtainAuthToken):
+    throttle_classes = [LoginRateThrottle]
+
+
 class CreateUserView(APIView):
+    throttle_classes = [RegisterRateThrottle]
+
     def post(self, request):
         user_serializer = UserRegisterSerializer(data=request.data)
         if user_serializer.is_valid(raise_exception=True):
@@ -21,10 +62,45 @@ class CreateUserView(APIView):
 
 class ListAllTodoItemsView(APIView):
     def get(self, request):
-        todo_serializer = TodoItemSerializer(TodoItem.objects.all(), many=True)
+        queryset = TodoItem.objects.prefetch_related("tags")
+        paginator = TimestampCursorPagination()
+        if paginator.is_requested(request):
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            todo_serializer = TodoItemSerializer(page, many=True)
+            return paginator.get_paginated_response(todo_serializer.data)
+        todo_serializer = TodoItemValuesSerializer(
+            TodoItem.objects.values(*TodoItemValuesSerializer.columns()), many=True
+        )
         return Response(todo_serializer.data, status=status.HTTP_200_OK)
 
 
+class ExportTodoItemsView(APIView):
+    def get(self, request):
+        queryset = TodoItem.objects.order_by("id").values(
+            *TodoItemValuesSerializer.columns()
+        )
+        return StreamingHttpResponse(
+            iter_ndjson(
+                queryset, TodoItemValuesSerializer, settings.TODO_EXPORT_CHUNK_SIZE
+            ),
+            content_type="application/x-ndjson",
+            status=status.HTTP_200_OK,
+        )
+
+
+class CacheStatsView(APIView):
+    def get(self, request):
+        return Response(cache_stats(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    def get(self, request):
+        # Prometheus text exposition format, not JSON
+        return HttpResponse(
+            expose_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
 class ListUserView(APIView):
     def get(self, request):
         user_serializer = UserSerializer(User.objects.all(), many=True)
@@ -36,7 +112,7 @@ class ListUserView(APIView):
 
 # -------------API DELIVERABLES-------------
 class CreateTodoItemView(APIView):
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -51,29 +127,92 @@ class CreateTodoItemView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-        tags = request.data.pop("tags", [])
+        tags_serializer = TodoItemTagsSerializer(data=request.data)
+        if not tags_serializer.is_valid():
+            return Response(tags_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        tags = tags_serializer.validated_data.get("tags", [])
+        request.data.pop("tags", None)
         request.data["user"] = self.request.user.pk
         todo_serializer = TodoItemSerializer(data=request.data)
         if todo_serializer.is_valid():
-            todo_serializer.save()
-            todo_instance = TodoItem.objects.get(id=todo_serializer.data["id"])
-            # for tag in tags:
-            #     tag, _ = Tag.objects.get_or_create(title=tag)
-            #     todo_instance.tags.add(tag)
-            # deserialized = TodoItemSerializer(todo_instance).data
-            deserialized = TodoItemSerializer(
-                get_instance_with_tags(todo_instance, tags)
-            ).data
+            # the item and its tags become visible together
+            with transaction.atomic():
+                todo_instance = get_instance_with_tags(todo_serializer.save(), tags)
+            deserialized = TodoItemSerializer(todo_instance).data
+            invalidate_user(self.request.user.pk)
+            publish(self.request.user.pk, "created", [todo_instance.pk])
             return Response(deserialized, status=status.HTTP_201_CREATED)
         else:
             return Response(todo_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkCreateTodoItemView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if not isinstance(request.data, list) or not all(
+            isinstance(item, dict) for item in request.data
+        ):
+            return Response(
+                {"error": "Expected a list of todo items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        tags_serializer = TodoItemTagsSerializer(data=request.data, many=True)
+        if not tags_serializer.is_valid():
+            return Response(tags_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        items, tags_per_item = [], []
+        for item, validated_tags in zip(request.data, tags_serializer.validated_data):
+            item = dict(item)
+            if "due_date" in item:
+                try:
+                    item["due_date"] = validate_due_date(item.get("due_date"))
+                except Exception as e:
+                    return Response(
+                        {"error": str(e)},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+            # items always belong to the requesting user, see below
+            item.pop("user", None)
+            item.pop("tags", None)
+            tags_per_item.append(validated_tags.get("tags", []))
+            items.append(item)
+
+        todo_serializer = TodoItemSerializer(data=items, many=True)
+        if not todo_serializer.is_valid():
+            return Response(todo_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            todo_instances = bulk_create_with_tags(
+                [
+                    TodoItem(user=self.request.user, **validated_data)
+                    for validated_data in todo_serializer.validated_data
+                ],
+                tags_per_item,
+            )
+        # bulk_create() sends no signals
+        refresh_status_counts([self.request.user.pk])
+        invalidate_user(self.request.user.pk)
+        publish(self.request.user.pk, "created", [todo.pk for todo in todo_instances])
+        deserialized = TodoItemSerializer(todo_instances, many=True).data
+        return Response(deserialized, status=status.HTTP_201_CREATED)
+
+
 class DetailTodoItemView(APIView):
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
+        etag, last_modified = detail_fingerprint(request, pk)
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: cached_response(request, lambda: self.retrieve(request, pk)),
+        )
+
+    def retrieve(self, request, pk):
         try:
             todo_serializer = TodoItemSerializer(
                 TodoItem.objects.get(id=pk, user=self.request.user)
@@ -84,21 +223,147 @@ class DetailTodoItemView(APIView):
 
 
 class ListTodoItemView(APIView):
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        todo_serializer = TodoItemSerializer(
-            TodoItem.objects.filter(user=self.request.user), many=True
+        etag, last_modified = list_fingerprint(request)
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: cached_response(request, lambda: self.list(request)),
         )
+
+    def list(self, request):
+        paginator = TimestampCursorPagination()
+        paginated = paginator.is_requested(request)
+        ordering = get_ordering(request.query_params)
+        if paginated and ordering not in (None, ["timestamp", "id"]):
+            raise ValidationError(
+                {"ordering": ["Only timestamp ordering supports cursor pagination."]}
+            )
+        fields = get_sparse_fields(request.query_params)
+
+        queryset = filter_todo_items(
+            TodoItem.objects.filter(user=self.request.user), request.query_params
+        )
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        if paginated:
+            # the paginator builds its cursors from the timestamp
+            queryset = select_fields(queryset, fields, required=["timestamp"])
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            todo_serializer = TodoItemSerializer(page, many=True, fields=fields)
+            return paginator.get_paginated_response(todo_serializer.data)
+        # whole lists can be large, so skip model instances, see
+        # TodoItemValuesSerializer
+        rows = queryset.values(*TodoItemValuesSerializer.columns(fields))
+        todo_serializer = TodoItemValuesSerializer(rows, many=True, fields=fields)
         return Response(todo_serializer.data, status=status.HTTP_200_OK)
 
 
+class SearchTodoItemView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return cached_response(request, lambda: self.search(request))
+
+    def search(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": ["This query parameter is required."]})
+
+        paginator = SearchPagination()
+        offset, limit = paginator.get_limits(request)
+        ids = paginator.get_page(search_todo_ids(request.user, text, offset, limit))
+        todo_instances = TodoItem.objects.prefetch_related("tags").in_bulk(ids)
+        # keep the ranking; items deleted since the search are skipped
+        page = [todo_instances[pk] for pk in ids if pk in todo_instances]
+        todo_serializer = TodoItemSerializer(page, many=True)
+        return paginator.get_paginated_response(todo_serializer.data)
+
+
+class StatsTodoItemView(APIView):
+    """Counts of the user's items by status, tag and due date."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return cached_response(
+            request,
+            lambda: Response(
+                todo_stats(request.user, timezone.localdate()),
+                status=status.HTTP_200_OK,
+            ),
+        )
+
+
+class SyncTodoItemView(APIView):
+    """
+    Without `?cursor=`, return every item of the user. With the cursor of an
+    earlier response, return the items created or updated since then and the
+    ids of those deleted since then. See api.sync.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        since = None
+        if "cursor" in request.query_params:
+            since = decode_cursor(request.query_params["cursor"])
+            if since is None:
+                raise ValidationError({"cursor": ["Invalid cursor."]})
+            retention = timedelta(days=settings.TODO_SYNC_RETENTION_DAYS)
+            if since < timezone.now() - retention:
+                # older tombstones may have been pruned
+                return Response(
+                    {"error": "Cursor expired, sync again without one."},
+                    status=status.HTTP_410_GONE,
+                )
+
+        now = timezone.now()
+        cursor = since or now
+        items, changes = changes_since(request.user, since)
+        changed, deleted = set(), set()
+        for pk, changed_at, is_deleted in changes:
+            (deleted if is_deleted else changed).add(pk)
+            cursor = max(cursor, changed_at)
+        # Everything written before now - overlap was committed when the
+        # changes were read, so the cursor can move up to there even without
+        # changes; otherwise clients that see none would run into the 410.
+        cursor = max(cursor, now - timedelta(seconds=settings.TODO_SYNC_OVERLAP))
+
+        todo_data = []
+        if changed:
+            rows = items.order_by("id").values(*TodoItemValuesSerializer.columns())
+            todo_data = TodoItemValuesSerializer(rows, many=True).data
+        return Response(
+            {
+                "cursor": encode_cursor(cursor),
+                "changed": todo_data,
+                # an id can be reused after its item was deleted
+                "deleted": sorted(deleted - changed),
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class UpdateTodoItemView(APIView):
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def put(self, request, pk):
+        return self.update(request, pk, partial=False)
+
+    def patch(self, request, pk):
+        return self.update(request, pk, partial=True)
+
+    def update(self, request, pk, partial):
         try:
             if "due_date" in request.data:
                 try:
@@ -111,17 +376,26 @@ class UpdateTodoItemView(APIView):
                         status=status.HTTP_400_BAD_REQUEST,
                     )
             todo_instance = TodoItem.objects.get(id=pk, user=self.request.user)
-            tags = request.data.pop("tags", [])
-            todo_instance.tags.clear()
+            # PUT replaces the tags (none given -> none kept), PATCH leaves them
+            # untouched unless "tags" is present.
+            tags_serializer = TodoItemTagsSerializer(data=request.data)
+            if not tags_serializer.is_valid():
+                return Response(
+                    tags_serializer.errors, status=status.HTTP_400_BAD_REQUEST
+                )
+            tags = tags_serializer.validated_data.get("tags", None if partial else [])
+            request.data.pop("tags", None)
             todo_serializer = TodoItemSerializer(
-                instance=todo_instance, data=request.data
+                instance=todo_instance, data=request.data, partial=partial
             )
             if todo_serializer.is_valid():
-                todo_serializer.save()
-                # prevv
-                deserialized = TodoItemSerializer(
-                    get_instance_with_tags(todo_instance, tags)
-                ).data
+                with transaction.atomic():
+                    todo_serializer.save()
+                    if tags is not None:
+                        set_tags(todo_instance, tags)
+                invalidate_user(self.request.user.pk)
+                publish(self.request.user.pk, "updated", [todo_instance.pk])
+                deserialized = TodoItemSerializer(todo_instance).data
                 return Response(deserialized, status=status.HTTP_200_OK)
             return Response(todo_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except ObjectDoesNotExist as e:
@@ -129,21 +403,190 @@ class UpdateTodoItemView(APIView):
 
 
 class DeleteTodoItemView(APIView):
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def delete(self, request, pk):
         try:
             todo_instance = TodoItem.objects.get(id=pk, user=self.request.user)
-            todo_instance.delete()
+            with transaction.atomic():
+                todo_instance.delete()
+                record_deletions(self.request.user.pk, [pk])
+            invalidate_user(self.request.user.pk)
+            publish(self.request.user.pk, "deleted", [pk])
             return Response({"message": f"Item {pk} deleted successfully!"})
         except ObjectDoesNotExist as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
 
 
-# class TagView(APIView):
-#     pass
+class BulkUpdateTodoItemView(APIView):
+    """
+    PATCH either `{"ids": [...], "changes": {...}}`, applying the same changes
+    to every id with one `UPDATE`, or a list of `{"id": ..., <field>: ...}`
+    objects, applied with one `bulk_update`. Tags are not bulk-updatable.
+    """
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request):
+        if isinstance(request.data, list):
+            results, written = self.update_each(request.data)
+        else:
+            results, written = self.update_all(request.data)
+        # neither update() nor bulk_update() sends signals
+        refresh_status_counts([self.request.user.pk])
+        invalidate_user(self.request.user.pk)
+        # only the rows written, requests with no changes publish nothing
+        publish(self.request.user.pk, "updated", sorted(written))
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def clean_changes(self, changes):
+        changes = dict(changes)
+        for field in ("id", "user", "timestamp"):
+            changes.pop(field, None)
+        if "tags" in changes:
+            raise ValidationError({"tags": ["Tags cannot be bulk updated."]})
+        if "due_date" in changes:
+            try:
+                changes["due_date"] = validate_due_date(changes.get("due_date"))
+            except Exception as e:
+                raise ValidationError({"error": str(e)})
+        todo_serializer = TodoItemSerializer(data=changes, partial=True)
+        todo_serializer.is_valid(raise_exception=True)
+        return todo_serializer.validated_data
+
+    def update_all(self, data):
+        bulk_serializer = BulkUpdateTodoItemSerializer(data=data)
+        bulk_serializer.is_valid(raise_exception=True)
+        ids = bulk_serializer.validated_data["ids"]
+        changes = self.clean_changes(bulk_serializer.validated_data["changes"])
+
+        with transaction.atomic():
+            found = set(
+                TodoItem.objects.filter(user=self.request.user, id__in=ids).values_list(
+                    "id", flat=True
+                )
+            )
+            if found and changes:
+                TodoItem.objects.filter(id__in=found).update(
+                    **changes, updated_at=timezone.now()
+                )
+        written = found if changes else set()
+        return self.results(ids, found, written), written
+
+    def update_each(self, data):
+        if not all(isinstance(item, dict) for item in data):
+            raise ValidationError({"error": "Expected a list of todo items."})
+        ids_serializer = TodoItemIdsSerializer(
+            data={"ids": [item.get("id") for item in data]}
+        )
+        ids_serializer.is_valid(raise_exception=True)
+        ids = ids_serializer.validated_data["ids"]
+        changes = [self.clean_changes(item) for item in data]
+
+        with transaction.atomic():
+            todo_instances = TodoItem.objects.filter(
+                user=self.request.user, id__in=ids
+            ).in_bulk()
+            written, fields = {}, set()
+            now = timezone.now()
+            for pk, item_changes in zip(ids, changes):
+                # entries without changes leave their item alone
+                if pk in todo_instances and item_changes:
+                    for field, value in item_changes.items():
+                        setattr(todo_instances[pk], field, value)
+                    todo_instances[pk].updated_at = now
+                    written[pk] = todo_instances[pk]
+                    fields.update(item_changes)
+            if written:
+                TodoItem.objects.bulk_update(written.values(), [*fields, "updated_at"])
+        return self.results(ids, todo_instances, written), set(written)
+
+    def results(self, ids, found, written):
+        results = []
+        for pk in ids:
+            if pk in written:
+                result = "updated"
+            elif pk in found:
+                result = "unchanged"
+            else:
+                result = "not found"
+            results.append({"id": pk, "result": result})
+        return results
+
+
+class BulkDeleteTodoItemView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def delete(self, request):
+        ids_serializer = TodoItemIdsSerializer(data=request.data)
+        ids_serializer.is_valid(raise_exception=True)
+        ids = ids_serializer.validated_data["ids"]
+
+        with transaction.atomic():
+            queryset = TodoItem.objects.filter(user=self.request.user, id__in=ids)
+            found = set(queryset.values_list("id", flat=True))
+            if found:
+                queryset.delete()
+                record_deletions(self.request.user.pk, found)
+        invalidate_user(self.request.user.pk)
+        publish(self.request.user.pk, "deleted", [pk for pk in ids if pk in found])
+        return Response(
+            {
+                "results": [
+                    {"id": pk, "result": "deleted" if pk in found else "not found"}
+                    for pk in ids
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class TagView(APIView):
+    """The user's tags by title, or those starting with `?q=`, with usage."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        paginator = SearchPagination()
+        offset, limit = paginator.get_limits(request)
+        end = offset + limit
+        tags = tags_by_title(request.user, request.query_params.get("q", "").strip())
+        page = paginator.get_page(list(tags[offset:end]))
+        tag_serializer = TagUsageSerializer(with_usage(request.user, page), many=True)
+        return paginator.get_paginated_response(tag_serializer.data)
+
+
+class TagAutocompleteView(APIView):
+    """The user's first few tags starting with `?q=`, for search-as-you-type."""
+
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        prefix = request.query_params.get("q", "").strip()
+        if not prefix:
+            raise ValidationError({"q": ["This query parameter is required."]})
+        tags = list(
+            tags_by_title(request.user, prefix)[: settings.TODO_TAG_SUGGESTIONS]
+        )
+        tag_serializer = TagUsageSerializer(with_usage(request.user, tags), many=True)
+        return Response(tag_serializer.data, status=status.HTTP_200_OK)
+
 
+class TagDetailView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
 
-# class TagDetailView(APIView):
-#     pass
+    def get(self, request, pk):
+        try:
+            tag_instance = user_tags(request.user).get(id=pk)
+            tag_serializer = TagUsageSerializer(
+                with_usage(request.user, [tag_instance])[0]
+            )
+            return Response(tag_serializer.data, status=status.HTTP_200_OK)
+        except ObjectDoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,45 @@
+"""
+Benchmarks for the todo API.
+
+Every module is a script run from the repository root, for example
+``python -m benchmarks.indexes --help``. They all work against a throwaway
+test database, so ``db.sqlite3`` is never touched.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+
+import django
+
+
+def setup():
+    """Configure Django for a standalone benchmark script."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo.settings")
+    # one log line per request would drown the results
+    os.environ.setdefault("TODO_PERFORMANCE_LOG_LEVEL", "WARNING")
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0):
+    """
+    Create a fully migrated test database and destroy it on exit.
+
+    SQLite gets a temporary file instead of Django's shared in-memory test
+    database, so benchmarks can hit it from several threads.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    with tempfile.TemporaryDirectory() as directory:
+        if connection.vendor == "sqlite":
+            test_name = os.path.join(directory, "benchmark.sqlite3")
+            connection.settings_dict["TEST"]["NAME"] = test_name
+        connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+            teardown_test_environment()
@@ -0,0 +1,80 @@
+"""
+Compress a todo list response and an NDJSON export at every gzip level (and
+brotli quality, when brotli is installed), reporting bytes saved and the CPU
+time spent per MB of JSON.
+
+    python -m benchmarks.compression --rows 20000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import setup, test_database
+
+
+def measure(compressor_class, chunks, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        compressor = compressor_class()
+        compressed = [compressor.compress(chunk) for chunk in chunks]
+        compressed.append(compressor.finish())
+        timings.append(time.process_time() - start)
+    return sum(map(len, compressed)), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test import override_settings
+
+    from api.middleware import BrotliCompressor, GzipCompressor, brotli
+    from api.models import TodoItem
+    from api.renderers import FastJSONRenderer
+    from api.serializers import TodoItemValuesSerializer
+    from api.utils import iter_ndjson
+    from benchmarks.seed import seed
+
+    with test_database():
+        seed(users=10, todos=args.rows, tags=100)
+        rows = TodoItem.objects.order_by("id").values(
+            *TodoItemValuesSerializer.columns()
+        )
+        payloads = {
+            # one body, compressed at once
+            "list": [FastJSONRenderer().render(TodoItemValuesSerializer(rows).data)],
+            # the export stream, flushed after every chunk
+            "export": list(
+                iter_ndjson(
+                    rows, TodoItemValuesSerializer, settings.TODO_EXPORT_CHUNK_SIZE
+                )
+            ),
+        }
+
+    settings_name = {"gzip": "TODO_GZIP_LEVEL", "br": "TODO_BROTLI_QUALITY"}
+    encodings = [("gzip", GzipCompressor, range(1, 10))]
+    if brotli is not None:
+        encodings.append(("br", BrotliCompressor, range(0, 12)))
+
+    for payload, chunks in payloads.items():
+        size = sum(map(len, chunks))
+        megabytes = size / 2**20
+        print(f"{payload}: {megabytes:.1f} MB in {len(chunks)} chunks")
+        for encoding, compressor_class, levels in encodings:
+            for level in levels:
+                with override_settings(**{settings_name[encoding]: level}):
+                    compressed, seconds = measure(compressor_class, chunks, args.repeat)
+                print(
+                    f"  {encoding:>4} {level:2}: {compressed / 2**10:8.0f} KB, "
+                    f"saves {100 * (1 - compressed / size):5.1f}%, "
+                    f"{seconds * 1000 / megabytes:6.2f} ms CPU/MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
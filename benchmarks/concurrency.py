@@ -0,0 +1,122 @@
+"""
+Compare the sync todo views served from a WSGI-style thread pool with the
+async views (``TODO_ASYNC_VIEWS``) served concurrently on one event loop.
+
+    python -m benchmarks.concurrency --requests 2000 --concurrency 1000
+
+Every request gets a unique query string so the per-user response cache of
+the sync views never answers it.
+"""
+import argparse
+import asyncio
+import importlib
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup, test_database
+
+PATHS = ["/api/todo/", "/api/todo/?status=OPEN", "/api/todo/?page_size=20"]
+
+
+def use_async_views(enabled):
+    """Re-import the URLconf so it routes the sync or the async views."""
+    from django.conf import settings
+    from django.urls import clear_url_caches
+
+    import api.urls
+    import todo.urls
+
+    settings.TODO_ASYNC_VIEWS = enabled
+    importlib.reload(api.urls)
+    importlib.reload(todo.urls)
+    clear_url_caches()
+
+
+def request_path(i):
+    path = PATHS[i % len(PATHS)]
+    return f"{path}{'&' if '?' in path else '?'}bench={i}"
+
+
+def summarize(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        "requests_per_s": len(latencies) / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_wsgi(headers, requests, threads):
+    from django.test import Client
+
+    def get(i):
+        start = time.perf_counter()
+        response = Client(headers=headers).get(request_path(i))
+        assert response.status_code == 200, response.content
+        return time.perf_counter() - start
+
+    use_async_views(False)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(get, range(requests)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_asgi(headers, requests, concurrency):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def get(i):
+        async with limit:
+            start = time.perf_counter()
+            response = await client.get(request_path(i), headers=headers)
+            assert response.status_code == 200, response.content
+            return time.perf_counter() - start
+
+    async def run():
+        return await asyncio.gather(*(get(i) for i in range(requests)))
+
+    use_async_views(True)
+    start = time.perf_counter()
+    latencies = asyncio.run(run())
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--todos", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.authtoken.models import Token
+
+    from benchmarks.seed import seed
+
+    with test_database():
+        (user,) = seed(users=1, todos=args.todos)
+        headers = {"Authorization": f"Token {Token.objects.create(user=user).key}"}
+
+        for name, result in [
+            (
+                f"wsgi ({args.threads} threads)",
+                run_wsgi(headers, args.requests, args.threads),
+            ),
+            (
+                f"asgi ({args.concurrency} concurrent)",
+                run_asgi(headers, args.requests, args.concurrency),
+            ),
+        ]:
+            print(
+                f"{name:>24}: {result['requests_per_s']:8.1f} req/s, "
+                f"mean {result['mean_ms']:8.2f} ms, p99 {result['p99_ms']:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Run a scripted scenario against each todo endpoint, in process through the
+WSGI handler, and report throughput, latency percentiles, queries and
+allocations per request.
+
+    python -m benchmarks.endpoints --requests 500 --output before.json
+    python -m benchmarks.endpoints --requests 500 --compare before.json
+
+Every request is timed in one pass. A second, shorter pass counts queries
+and traces allocations, which would otherwise skew the timings. Reads get a
+unique query string so the response cache never answers them.
+"""
+import abc
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks import setup, test_database
+
+PASSWORD = "bench-password"
+
+
+class Scenario(abc.ABC):
+    """
+    Requests of one endpoint: `prepare(count)` creates whatever `request(i)`
+    needs for `count` requests without being timed.
+    """
+
+    name = None
+    expected_status = 200
+
+    def __init__(self, user, token):
+        from django.test import Client
+
+        self.user = user
+        self.client = Client(headers={"Authorization": f"Token {token}"})
+        self.todo_ids = list(
+            user.todoitem_set.order_by("id").values_list("id", flat=True)
+        )
+
+    def prepare(self, count):
+        pass
+
+    @abc.abstractmethod
+    def request(self, i):
+        """Send the `i`-th request and return its response."""
+
+
+class ListScenario(Scenario):
+    name = "list"
+
+    def request(self, i):
+        return self.client.get(f"/api/todo/?page_size=50&bench={i}")
+
+
+class DetailScenario(Scenario):
+    name = "detail"
+
+    def request(self, i):
+        pk = self.todo_ids[i % len(self.todo_ids)]
+        return self.client.get(f"/api/todo/{pk}/?bench={i}")
+
+
+class CreateScenario(Scenario):
+    name = "create"
+    expected_status = 201
+
+    def request(self, i):
+        return self.client.post(
+            "/api/todo/create/",
+            {"title": f"bench {i}", "status": "OPEN", "tags": ["tag-0", "new"]},
+            content_type="application/json",
+        )
+
+
+class UpdateScenario(Scenario):
+    name = "update"
+
+    def request(self, i):
+        pk = self.todo_ids[i % len(self.todo_ids)]
+        return self.client.patch(
+            f"/api/todo/update/{pk}/",
+            {"status": "WORKING" if i % 2 else "DONE", "tags": ["tag-1"]},
+            content_type="application/json",
+        )
+
+
+class DeleteScenario(Scenario):
+    name = "delete"
+
+    def prepare(self, count):
+        from api.models import TodoItem
+
+        self.todo_ids = [
+            todo.pk
+            for todo in TodoItem.objects.bulk_create(
+                TodoItem(title=f"delete {i}", status="OPEN", user=self.user)
+                for i in range(count)
+            )
+        ]
+
+    def request(self, i):
+        return self.client.delete(f"/api/todo/delete/{self.todo_ids[i]}/")
+
+
+class LoginScenario(Scenario):
+    name = "login"
+
+    def request(self, i):
+        from django.test import Client
+
+        return Client().post(
+            "/api/login/",
+            {"username": self.user.username, "password": PASSWORD},
+            content_type="application/json",
+        )
+
+
+SCENARIOS = [
+    ListScenario,
+    DetailScenario,
+    CreateScenario,
+    UpdateScenario,
+    DeleteScenario,
+    LoginScenario,
+]
+
+
+def percentile(ordered, fraction):
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)]
+
+
+def check(scenario, response):
+    assert response.status_code == scenario.expected_status, (
+        scenario.name,
+        response.status_code,
+        response.content,
+    )
+
+
+def run(scenario, requests, warmup, profiled):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    scenario.prepare(warmup + requests + profiled)
+    for i in range(warmup):
+        check(scenario, scenario.request(i))
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        request_start = time.perf_counter()
+        response = scenario.request(i)
+        latencies.append(time.perf_counter() - request_start)
+        check(scenario, response)
+    elapsed = time.perf_counter() - start
+
+    queries, allocated = [], []
+    tracemalloc.start()
+    try:
+        for i in range(warmup + requests, warmup + requests + profiled):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            with CaptureQueriesContext(connection) as context:
+                check(scenario, scenario.request(i))
+            _, peak = tracemalloc.get_traced_memory()
+            queries.append(len(context))
+            allocated.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "requests_per_s": requests / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "queries_per_request": statistics.mean(queries),
+        "peak_kib_per_request": statistics.mean(allocated) / 1024,
+    }
+
+
+def metadata(args):
+    from django import get_version
+    from django.conf import settings
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "django": get_version(),
+        "database": connection.vendor,
+        "password_hasher": settings.PASSWORD_HASHERS[0].rsplit(".", 1)[-1],
+        "args": vars(args),
+    }
+
+
+def report(results, baseline=None):
+    columns = "req/s", "p50 ms", "p99 ms", "queries", "peak KiB"
+    keys = (
+        "requests_per_s",
+        "p50_ms",
+        "p99_ms",
+        "queries_per_request",
+        "peak_kib_per_request",
+    )
+    print(f"{'scenario':>10} " + " ".join(f"{column:>18}" for column in columns))
+    for name, result in results.items():
+        cells = []
+        for key in keys:
+            cell = f"{result[key]:.2f}"
+            previous = (baseline or {}).get(name, {}).get(key)
+            if previous:
+                cell += f" ({(result[key] - previous) / previous:+.0%})"
+            cells.append(f"{cell:>18}")
+        print(f"{name:>10} " + " ".join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--todos", type=int, default=10000)
+    parser.add_argument("--tags", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--profiled", type=int, default=20)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        choices=[scenario.name for scenario in SCENARIOS],
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="show changes against this JSON file")
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.authtoken.models import Token
+
+    from api.views import LoginView
+    from benchmarks.seed import seed
+
+    # measure the view, not the login throttle
+    LoginView.throttle_classes = []
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["scenarios"]
+
+    results = {}
+    with test_database():
+        users = seed(
+            users=args.users, todos=args.todos, tags=args.tags, password=PASSWORD
+        )
+        token = Token.objects.create(user=users[0]).key
+        for scenario_class in SCENARIOS:
+            if args.scenarios and scenario_class.name not in args.scenarios:
+                continue
+            scenario = scenario_class(users[0], token)
+            results[scenario.name] = run(
+                scenario, args.requests, args.warmup, args.profiled
+            )
+        meta = metadata(args)
+
+    report(results, baseline)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"meta": meta, "scenarios": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compare query plans and latencies of the main TodoItem query shapes with the
+composite indexes of ``TodoItem.Meta`` against the original single index on
+``user``.
+
+    python -m benchmarks.indexes --rows 1000000 --users 1000
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from benchmarks import setup, test_database
+
+
+def query_shapes(user):
+    from django.db.models import Q
+
+    from api.models import TodoItem
+
+    today = date.today()
+    first = TodoItem.objects.filter(user=user).order_by("timestamp", "id")[50]
+    return {
+        "list": TodoItem.objects.filter(user=user).order_by("timestamp", "id")[:100],
+        "keyset page": TodoItem.objects.filter(user=user)
+        .filter(
+            Q(timestamp__gte=first.timestamp)
+            & (Q(timestamp__gt=first.timestamp) | Q(id__gt=first.id))
+        )
+        .order_by("timestamp", "id")[:100],
+        "status": TodoItem.objects.filter(user=user, status="DONE"),
+        "due date range": TodoItem.objects.filter(
+            user=user, due_date__range=(today, today + timedelta(days=7))
+        ),
+    }
+
+
+def measure(user, repeat):
+    results = {}
+    for name, queryset in query_shapes(user).items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            "plan": queryset.explain(),
+            "median_ms": statistics.median(timings),
+        }
+    return results
+
+
+def use_indexes(connection, composite):
+    """
+    Switch between the original `user` foreign key index and the composite
+    indexes declared on the model.
+    """
+    from django.db import models
+
+    from api.models import TodoItem
+
+    baseline = models.Index(fields=["user"], name="todo_user_fk_idx")
+    with connection.schema_editor() as editor:
+        for index in TodoItem._meta.indexes:
+            if composite:
+                editor.add_index(TodoItem, index)
+            else:
+                editor.remove_index(TodoItem, index)
+        if composite:
+            editor.remove_index(TodoItem, baseline)
+        else:
+            editor.add_index(TodoItem, baseline)
+
+
+def analyze(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from benchmarks.seed import seed
+
+    with test_database() as connection:
+        use_indexes(connection, composite=False)
+        user = seed(users=args.users, todos=args.rows)[0]
+        analyze(connection)
+        before = measure(user, args.repeat)
+
+        use_indexes(connection, composite=True)
+        analyze(connection)
+        after = measure(user, args.repeat)
+
+    print(f"{args.rows} rows, {args.users} users, median of {args.repeat} runs\n")
+    for name in before:
+        print(f"== {name}")
+        for label, result in (("before", before[name]), ("after", after[name])):
+            print(f"  {label}: {result['median_ms']:.3f} ms")
+            for line in result["plan"].splitlines():
+                print(f"    {line}")
+        speedup = before[name]["median_ms"] / max(after[name]["median_ms"], 1e-9)
+        print(f"  speedup: {speedup:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
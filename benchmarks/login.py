@@ -0,0 +1,87 @@
+"""
+Measure login throughput of POST /api/login/ under each password hasher
+policy in ``TODO_PASSWORD_HASHER_POLICIES``.
+
+    python -m benchmarks.login --logins 50 --threads 4
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+from benchmarks import setup, test_database
+
+
+def login_once(username):
+    from rest_framework.test import APIClient
+
+    start = time.perf_counter()
+    response = APIClient().post(
+        "/api/login/", {"username": username, "password": "password"}, format="json"
+    )
+    assert response.status_code == 200, response.content
+    return time.perf_counter() - start
+
+
+def measure(policy, logins, threads):
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import override_settings
+    from rest_framework.authtoken.models import Token
+
+    hashers = settings.TODO_PASSWORD_HASHER_POLICIES[policy]
+    with override_settings(PASSWORD_HASHERS=hashers):
+        usernames = [f"bench-login-{policy}-{i}" for i in range(threads)]
+        for username in usernames:
+            user = User.objects.create_user(username=username, password="password")
+            # logins then only read, so threads never wait on SQLite write locks
+            Token.objects.create(user=user)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(
+                pool.map(login_once, (usernames[i % threads] for i in range(logins)))
+            )
+        elapsed = time.perf_counter() - start
+
+    return {
+        "hasher": hashers[0].rsplit(".", 1)[-1],
+        "logins_per_s": logins / elapsed,
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p99_ms": sorted(latencies)[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--policy", action="append", dest="policies")
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+
+    from api.views import LoginView
+
+    policies = args.policies or [
+        policy
+        for policy in settings.TODO_PASSWORD_HASHER_POLICIES
+        if policy != "argon2" or find_spec("argon2")
+    ]
+    # measure hashing, not the login throttle
+    LoginView.throttle_classes = []
+
+    with test_database():
+        for policy in policies:
+            result = measure(policy, args.logins, args.threads)
+            print(
+                f"{policy:>8} ({result['hasher']}): "
+                f"{result['logins_per_s']:8.1f} logins/s, "
+                f"mean {result['mean_ms']:7.2f} ms, p99 {result['p99_ms']:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
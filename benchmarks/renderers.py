@@ -0,0 +1,78 @@
+"""
+Render a serialized todo list with DRF's JSONRenderer and with
+``api.renderers.FastJSONRenderer`` on each backend, reporting render time
+and peak allocations per MB of JSON output.
+
+    python -m benchmarks.renderers --rows 50000
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks import setup, test_database
+
+
+def measure(render, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = render(data)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    render(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    megabytes = len(output) / 2**20
+    return output, {
+        "megabytes": megabytes,
+        "ms_per_mb": statistics.median(timings) * 1000 / megabytes,
+        "peak_mb_per_mb": peak / 2**20 / megabytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup()
+    from django.test import override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    from api.models import TodoItem
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import TodoItemValuesSerializer
+    from benchmarks.seed import seed
+
+    renderers = {"drf": JSONRenderer().render}
+    for backend in ["stdlib", "orjson"] if orjson else ["stdlib"]:
+
+        def render(data, backend=backend):
+            with override_settings(TODO_JSON_BACKEND=backend):
+                return FastJSONRenderer().render(data)
+
+        renderers[backend] = render
+
+    with test_database():
+        seed(users=10, todos=args.rows, tags=100)
+        rows = TodoItem.objects.order_by("id").values(
+            *TodoItemValuesSerializer.columns()
+        )
+        data = TodoItemValuesSerializer(rows, many=True).data
+
+    expected = None
+    for name, render in renderers.items():
+        output, result = measure(render, data, args.repeat)
+        expected = expected or output
+        assert output == expected, f"{name} output differs"
+        print(
+            f"{name:>6}: {result['megabytes']:.1f} MB, "
+            f"{result['ms_per_mb']:6.2f} ms/MB, "
+            f"peak allocations {result['peak_mb_per_mb']:.2f} MB/MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure todo search latency with the full-text index (``api.search``)
+against plain substring matching, for one user of a large table.
+
+    python -m benchmarks.search --rows 1000000 --users 1000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import setup, test_database
+
+QUERIES = {
+    "common word": "buy",
+    "rare word": "taxes",
+    "two words": "write report",
+    "prefix": "re",
+    "no match": "unicorn",
+}
+
+
+def measure(search, user, text, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ids = search(user, text)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "results": len(ids),
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": timings[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="merge the FTS index segments left by row-by-row inserts first",
+    )
+    args = parser.parse_args()
+
+    setup()
+    from api.search import fallback_search, search_terms, search_todo_ids
+    from benchmarks.seed import seed
+
+    def indexed(user, text):
+        return search_todo_ids(user, text, 0, args.page_size + 1)
+
+    def substring(user, text):
+        return fallback_search(user, search_terms(text), 0, args.page_size + 1)
+
+    with test_database() as connection:
+        start = time.perf_counter()
+        user = seed(users=args.users, todos=args.rows)[0]
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if args.optimize and connection.vendor == "sqlite":
+                cursor.execute(
+                    "INSERT INTO api_todoitem_fts (api_todoitem_fts) VALUES ('optimize')"
+                )
+
+        for name, text in QUERIES.items():
+            for method, search in [("fts", indexed), ("substring", substring)]:
+                result = measure(search, user, text, args.repeat)
+                print(
+                    f"{name:>12} {method:>9}: {result['results']:4} results, "
+                    f"median {result['median_ms']:8.2f} ms, "
+                    f"max {result['max_ms']:8.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
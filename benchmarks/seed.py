@@ -0,0 +1,109 @@
+"""
+Seed the benchmark database with users and todo items.
+"""
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from api.models import Tag, TodoItem
+
+STATUSES = [choice for choice, _ in TodoItem.STATUS_CHOICES]
+
+WORDS = (
+    "buy milk bread eggs call mom dentist appointment write report review pull "
+    "request fix bug deploy release plan sprint meeting notes email client "
+    "invoice pay rent book flight hotel renew passport clean kitchen garage "
+    "water plants walk dog gym run yoga read chapter draft proposal budget "
+    "update docs refactor tests migrate database backup server order pizza "
+    "birthday gift party schedule interview prepare slides quarterly taxes"
+).split()
+
+# word frequencies follow Zipf's law, like natural text
+WORD_WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+
+
+def sentence(rng, low, high):
+    return " ".join(rng.choices(WORDS, weights=WORD_WEIGHTS, k=rng.randint(low, high)))
+
+
+@contextmanager
+def explicit_timestamps():
+    # `auto_now_add` would stamp every seeded row with the same "now"; turn it
+    # off so rows get spread-out creation times like a real table.
+    field = TodoItem._meta.get_field("timestamp")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def seed(
+    users=10,
+    todos=1000,
+    tags=0,
+    max_tags_per_todo=3,
+    password=None,
+    batch_size=5000,
+    seed=0,
+):
+    """
+    Insert `users` users, `todos` todo items spread across them and `tags`
+    tags.
+
+    Items get a few random words as title and description, a random status,
+    a due date within two months of today (or none), a creation time within
+    the last year and up to `max_tags_per_todo` tags. Tag popularity follows
+    Zipf's law, so a few tags are on many items and most are rare. Users get
+    `password` (hashed once and shared) or an unusable one. Returns the users.
+    """
+    rng = random.Random(seed)
+    hashed = make_password(password)
+    user_instances = User.objects.bulk_create(
+        [User(username=f"bench-user-{i}", password=hashed) for i in range(users)]
+    )
+    tag_instances = Tag.objects.bulk_create(
+        [Tag(title=f"tag-{i}") for i in range(tags)]
+    )
+    tag_weights = [1 / rank for rank in range(1, tags + 1)]
+    today = date.today()
+    now = timezone.now()
+
+    with explicit_timestamps():
+        for start in range(0, todos, batch_size):
+            todo_instances = TodoItem.objects.bulk_create(
+                [
+                    TodoItem(
+                        title=sentence(rng, 2, 6),
+                        description=sentence(rng, 0, 20),
+                        user=rng.choice(user_instances),
+                        status=rng.choice(STATUSES),
+                        due_date=(
+                            today + timedelta(days=rng.randint(-60, 60))
+                            if rng.random() < 0.8
+                            else None
+                        ),
+                        timestamp=now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+                    )
+                    for i in range(start, min(start + batch_size, todos))
+                ]
+            )
+            if tag_instances:
+                TodoItem.tags.through.objects.bulk_create(
+                    [
+                        TodoItem.tags.through(todoitem_id=todo.pk, tag_id=tag.pk)
+                        for todo in todo_instances
+                        for tag in set(
+                            rng.choices(
+                                tag_instances,
+                                weights=tag_weights,
+                                k=rng.randint(0, max_tags_per_todo),
+                            )
+                        )
+                    ]
+                )
+    return user_instances
@@ -0,0 +1,63 @@
+"""
+Serialize the same todo items with ``TodoItemSerializer`` and with the
+``.values()`` based ``TodoItemValuesSerializer``, timing both from queryset
+to ``.data`` and checking that their output is identical.
+
+    python -m benchmarks.serializers --rows 100000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import setup, test_database
+
+
+def measure(serialize, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = serialize()
+        timings.append(time.perf_counter() - start)
+    return data, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    from api.models import TodoItem
+    from api.serializers import TodoItemSerializer, TodoItemValuesSerializer
+    from benchmarks.seed import seed
+
+    def model_serializer(fields):
+        queryset = TodoItem.objects.order_by("id").prefetch_related("tags")
+        return TodoItemSerializer(queryset, many=True, fields=fields).data
+
+    def values_serializer(fields):
+        columns = TodoItemValuesSerializer.columns(fields)
+        rows = TodoItem.objects.order_by("id").values(*columns)
+        return TodoItemValuesSerializer(rows, many=True, fields=fields).data
+
+    with test_database():
+        start = time.perf_counter()
+        seed(users=100, todos=args.rows, tags=args.tags)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        for fields in [None, ["id", "title", "status"]]:
+            label = "all fields" if fields is None else ",".join(fields)
+            expected, slow = measure(lambda: model_serializer(fields), args.repeat)
+            data, fast = measure(lambda: values_serializer(fields), args.repeat)
+            assert data == expected, "outputs differ"
+            print(
+                f"{label:>16}: TodoItemSerializer {slow * 1000:8.1f} ms, "
+                f"TodoItemValuesSerializer {fast * 1000:8.1f} ms "
+                f"({slow / fast:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
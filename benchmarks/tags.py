@@ -0,0 +1,77 @@
+"""
+Measure tags/autocomplete/ latency for prefixes of varying selectivity, for
+one user among many sharing a catalog of Zipf-distributed tags over a large
+todo table. "cold" is the first request, which counts the user's usage of
+the tags it returns; later requests find those counts cached.
+
+    python -m benchmarks.tags --rows 1000000 --tags 10000
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks import setup, test_database
+
+PREFIXES = {
+    "every tag": "t",
+    "most used": "tag-0",
+    "hundreds": "tag-1",
+    "a few": "tag-999",
+    "no match": "x",
+}
+
+
+def measure(client, prefix, repeat):
+    from django.core.cache import cache
+
+    cache.clear()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/api/tags/autocomplete/", {"q": prefix})
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.content
+    cold = timings[0]
+    timings = sorted(timings[1:])
+    return {
+        "results": len(response.data),
+        "cold_ms": cold * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": timings[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.test import APIClient
+
+    from benchmarks.seed import seed
+
+    with test_database() as connection:
+        start = time.perf_counter()
+        user = seed(users=args.users, todos=args.rows, tags=args.tags)[0]
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        for name, prefix in PREFIXES.items():
+            result = measure(client, prefix, args.repeat)
+            print(
+                f"{name:>10} {prefix!r:>9}: {result['results']:3} tags, "
+                f"cold {result['cold_ms']:7.2f} ms, "
+                f"median {result['median_ms']:7.2f} ms, "
+                f"max {result['max_ms']:7.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
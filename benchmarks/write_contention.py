@@ -0,0 +1,118 @@
+"""
+Measure the todo API under concurrent writers and readers with SQLite's
+default profile (rollback journal, synchronous=FULL, reconnect per request)
+and with the tuned profile from ``todo.settings`` (WAL, synchronous=NORMAL,
+busy_timeout, mmap, larger page cache, persistent connections).
+
+    python -m benchmarks.write_contention --threads 8 --requests 200
+"""
+import argparse
+import statistics
+import threading
+import time
+
+from benchmarks import setup, test_database
+
+DEFAULT_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def worker(token, requests, write_ratio, results):
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    writes = int(1 / write_ratio) if write_ratio else 0
+    try:
+        for i in range(requests):
+            start = time.perf_counter()
+            if writes and i % writes == 0:
+                response = client.post(
+                    "/api/todo/create/",
+                    {"title": f"bench {i}", "status": "OPEN", "tags": ["bench"]},
+                    format="json",
+                )
+            else:
+                # unique paths bypass the response cache
+                response = client.get(f"/api/todo/?page_size=20&bench={i}")
+            elapsed = time.perf_counter() - start
+            if response.status_code in (200, 201):
+                results["latencies"].append(elapsed)
+            else:
+                results["errors"] += 1
+    except Exception as e:  # "database is locked" surfaces as OperationalError
+        results["errors"] += 1
+        results["messages"].add(str(e))
+    finally:
+        connections.close_all()
+
+
+def measure(profile, pragmas, conn_max_age, users, args):
+    from django.db import connection
+    from django.test import override_settings
+
+    # the worker threads share this settings dict
+    connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+    results = {"latencies": [], "errors": 0, "messages": set()}
+    with override_settings(TODO_SQLITE_PRAGMAS=pragmas):
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(users[i % len(users)], args.requests, args.write_ratio, results),
+            )
+            for i in range(args.threads)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(results["latencies"])
+    print(
+        f"{profile:>8}: {len(latencies) / elapsed:8.1f} req/s, "
+        f"mean {statistics.mean(latencies) * 1000:7.2f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.2f} ms, "
+        f"{results['errors']} errors"
+    )
+    for message in results["messages"]:
+        print(f"          {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.5)
+    parser.add_argument("--todos", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.authtoken.models import Token
+
+    from benchmarks.seed import seed
+
+    with test_database():
+        if connection.vendor != "sqlite":
+            parser.error("this benchmark compares SQLite profiles")
+        users = seed(users=args.threads, todos=args.todos)
+        tokens = [Token.objects.create(user=user).key for user in users]
+        # journal_mode is stored in the file, so switch it with no other
+        # connection open
+        connection.close()
+
+        measure("default", DEFAULT_PRAGMAS, 0, tokens, args)
+        measure(
+            "tuned",
+            settings.TODO_SQLITE_PRAGMAS,
+            settings.TODO_DB_CONN_MAX_AGE,
+            tokens,
+            args,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 ASGI config for todo project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The todo/events/ stream is only served here, not by the WSGI application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -12,5 +13,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "todo.settings")
+# read by the settings, e.g. to disable persistent database connections
+os.environ.setdefault("TODO_ASGI", "1")
 
 application = get_asgi_application()
@@ -10,6 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,6 +46,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # first, so it times the whole request
+    "api.middleware.PerformanceMiddleware",
+    # before anything else that reads or changes the body
+    "api.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -76,14 +83,125 @@ WSGI_APPLICATION = "todo.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# TODO_DB_ENGINE selects "sqlite" (default) or "postgresql"; the other
+# TODO_DB_* variables describe the server. Connections are kept open for
+# TODO_DB_CONN_MAX_AGE seconds (0 reconnects on every request) and checked
+# before reuse.
+TODO_DB_ENGINE = os.environ.get("TODO_DB_ENGINE", "sqlite")
+
+# Under ASGI (todo.asgi sets TODO_ASGI) every sync_to_async thread would keep
+# its own persistent connection, so connections are closed after each request
+# there, as Django recommends, unless TODO_DB_CONN_MAX_AGE says otherwise.
+TODO_DB_CONN_MAX_AGE = int(
+    os.environ.get(
+        "TODO_DB_CONN_MAX_AGE", 0 if os.environ.get("TODO_ASGI") == "1" else 60
+    )
+)
+
+if TODO_DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("TODO_DB_NAME", "todo"),
+            "USER": os.environ.get("TODO_DB_USER", "todo"),
+            "PASSWORD": os.environ.get("TODO_DB_PASSWORD", ""),
+            "HOST": os.environ.get("TODO_DB_HOST", "localhost"),
+            "PORT": os.environ.get("TODO_DB_PORT", "5432"),
+            "CONN_MAX_AGE": TODO_DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            # behind a transaction-pooling PgBouncer, server-side cursors
+            # (QuerySet.iterator()) must be off
+            "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("TODO_DB_POOLER", "") == "1",
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("TODO_DB_NAME", BASE_DIR / "db.sqlite3"),
+            "CONN_MAX_AGE": TODO_DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+
+# PRAGMAs run on every new SQLite connection by api.db.configure_sqlite. WAL
+# lets readers work alongside the single writer, NORMAL only syncs at
+# checkpoints (safe with WAL), and writers wait up to busy_timeout ms for the
+# write lock instead of failing with "database is locked".
+TODO_SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("TODO_SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("TODO_SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.environ.get("TODO_SQLITE_BUSY_TIMEOUT", 5000)),
+    "mmap_size": int(os.environ.get("TODO_SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+    # negative values are KiB rather than pages
+    "cache_size": int(os.environ.get("TODO_SQLITE_CACHE_SIZE", -64 * 1024)),
+    "temp_store": "MEMORY",
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.environ.get(
+            "TODO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("TODO_CACHE_LOCATION", "todo"),
     }
 }
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+
+# The first hasher of a policy hashes new passwords; the others only verify
+# existing hashes, which are upgraded on the next successful login.
+TODO_PASSWORD_HASHER_POLICIES = {
+    "argon2": [
+        "api.hashers.TunedArgon2PasswordHasher",
+        "api.hashers.TunedScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ],
+    "scrypt": [
+        "api.hashers.TunedScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ],
+    "pbkdf2": [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "api.hashers.TunedScryptPasswordHasher",
+    ],
+    # only for tests and benchmarks, never for real passwords
+    "fast": [
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ],
+}
+
+# argon2 needs the optional argon2-cffi package
+TODO_PASSWORD_HASHER_POLICY = os.environ.get(
+    "TODO_PASSWORD_HASHER", "argon2" if find_spec("argon2") else "scrypt"
+)
+
+# The test suite checks behaviour, not hashing cost.
+if sys.argv[1:2] == ["test"]:
+    TODO_PASSWORD_HASHER_POLICY = "fast"
+
+PASSWORD_HASHERS = TODO_PASSWORD_HASHER_POLICIES[TODO_PASSWORD_HASHER_POLICY]
+
+TODO_ARGON2_TIME_COST = int(os.environ.get("TODO_ARGON2_TIME_COST", 2))
+
+TODO_ARGON2_MEMORY_COST = int(os.environ.get("TODO_ARGON2_MEMORY_COST", 19456))
+
+TODO_ARGON2_PARALLELISM = int(os.environ.get("TODO_ARGON2_PARALLELISM", 1))
+
+TODO_SCRYPT_WORK_FACTOR = int(os.environ.get("TODO_SCRYPT_WORK_FACTOR", 2**14))
+
+TODO_SCRYPT_BLOCK_SIZE = int(os.environ.get("TODO_SCRYPT_BLOCK_SIZE", 8))
+
+TODO_SCRYPT_PARALLELISM = int(os.environ.get("TODO_SCRYPT_PARALLELISM", 1))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -124,3 +242,143 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # token bucket sizes per client IP, see api.throttling
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.environ.get("TODO_LOGIN_RATE", "10/min"),
+        "register": os.environ.get("TODO_REGISTER_RATE", "5/min"),
+    },
+}
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+# api.performance logs one line of timings per request at INFO.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "api.performance": {
+            "handlers": ["console"],
+            "level": os.environ.get(
+                "TODO_PERFORMANCE_LOG_LEVEL",
+                "WARNING" if sys.argv[1:2] == ["test"] else "INFO",
+            ),
+            "propagate": False,
+        },
+    },
+}
+
+
+# Todo API
+
+# Default and maximum page size for cursor-paginated todo listings
+# (used when a request passes `cursor` or `page_size`).
+TODO_PAGE_SIZE = 100
+
+TODO_MAX_PAGE_SIZE = 1000
+
+# Cache alias and lifetime (seconds) of the per-user todo response cache.
+TODO_CACHE_ALIAS = "default"
+
+TODO_CACHE_TIMEOUT = 300
+
+# Token lookups cached by api.authentication.CachedTokenAuthentication: entries
+# in the per-process LRU, their lifetime there, and lifetime in the shared cache.
+# Deleted tokens and deactivated users may stay valid in other processes for
+# up to TODO_TOKEN_CACHE_LOCAL_TTL seconds.
+TODO_TOKEN_CACHE_SIZE = 1024
+
+TODO_TOKEN_CACHE_LOCAL_TTL = 30
+
+TODO_TOKEN_CACHE_TIMEOUT = 300
+
+# Route the todo endpoints to the ASGI-native views in api.async_views.
+TODO_ASYNC_VIEWS = os.environ.get("TODO_ASYNC_VIEWS", "") == "1"
+
+# Rows fetched (and tags batch-loaded) per round trip by the NDJSON export.
+TODO_EXPORT_CHUNK_SIZE = 2000
+
+# Report per-request timings in a Server-Timing response header. They reveal
+# how long queries take, so turn this off when that should stay private.
+TODO_SERVER_TIMING = os.environ.get("TODO_SERVER_TIMING", "1") == "1"
+
+# Response compression, see api.middleware.CompressionMiddleware. brotli is
+# used when the optional brotli package is installed and the client takes it.
+TODO_COMPRESSION = os.environ.get("TODO_COMPRESSION", "1") == "1"
+
+# Smaller bodies are sent as they are.
+TODO_COMPRESSION_MIN_SIZE = int(os.environ.get("TODO_COMPRESSION_MIN_SIZE", 1024))
+
+# HTML is left out: the admin and browsable API pages carry CSRF tokens,
+# which compression would expose to BREACH.
+TODO_COMPRESSION_TYPES = [
+    "application/json",
+    "application/x-ndjson",
+    "text/plain",
+]
+
+# 1-9. On todo JSON, 4 saves 80% of the bytes at half the CPU time of
+# zlib's default 6, which saves 83%; see benchmarks/compression.py.
+TODO_GZIP_LEVEL = int(os.environ.get("TODO_GZIP_LEVEL", 4))
+
+# 0-11; the top qualities are meant for static files, not per response.
+TODO_BROTLI_QUALITY = int(os.environ.get("TODO_BROTLI_QUALITY", 4))
+
+# Items marked per transaction by the mark_overdue command; bounds how long
+# each UPDATE holds its locks.
+TODO_OVERDUE_CHUNK_SIZE = 1000
+
+# Keep per-user status counts in api_todostatuscount, so the stats endpoint
+# reads them instead of grouping every item. Costs an extra query per write.
+TODO_STATS_COUNTERS = os.environ.get("TODO_STATS_COUNTERS", "") == "1"
+
+# Seconds each delta sync looks back before its cursor, for writes that were
+# not yet committed at the previous sync; see api.sync.
+TODO_SYNC_OVERLAP = 5
+
+# Days deletions are kept for delta sync (prune_tombstones removes older
+# ones). Clients with an older cursor have to sync from scratch.
+TODO_SYNC_RETENTION_DAYS = 30
+
+# Tags returned per tags/autocomplete/ request.
+TODO_TAG_SUGGESTIONS = 10
+
+# JSON encoding of API responses, see api.renderers. orjson needs the
+# optional orjson package; "stdlib" uses the json module.
+TODO_JSON_BACKEND = os.environ.get(
+    "TODO_JSON_BACKEND", "orjson" if find_spec("orjson") else "stdlib"
+)
+
+# Seconds a tag's usage count is cached. Tagging refreshes it right away,
+# deleting tagged items only once it expires.
+TODO_TAG_USAGE_TIMEOUT = 60
+
+# Hub delivering todo/events/ streams, see api.events. LocalHub reaches the
+# streams of its own process only; multi-worker deployments need a backend
+# that fans out across workers.
+TODO_EVENTS_BACKEND = os.environ.get("TODO_EVENTS_BACKEND", "api.events.LocalHub")
+
+# Events queued per stream. A stream that falls further behind is reset and
+# its client syncs again.
+TODO_EVENTS_QUEUE_SIZE = 100
+
+# Seconds between heartbeat comments on an idle stream.
+TODO_EVENTS_HEARTBEAT = 15
+
+# Seconds a stream lasts before the client has to reconnect.
+TODO_EVENTS_MAX_AGE = 300
+
+# Seconds clients wait before reconnecting (the stream's `retry:` field).
+TODO_EVENTS_RETRY = 3